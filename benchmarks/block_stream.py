@@ -0,0 +1,185 @@
+"""
+Block page decoding benchmark : peak RSS, peak traced memory and longest event loop stall while listing child blocks,
+buffered (notion_client) vs incremental streaming decode (needs optional 'ijson' package).
+"shallow" case lists top-level blocks of a page. "deep" case also walks a chain of nested blocks depth-first,
+so a response of every level is open while its children are listed, like rendering nested toggles.
+Each run is its own process, so peak RSS of one doesn't hide the other.
+Usage : python -m benchmarks.block_stream [--pages N] [--blocks N] [--segments N] [--depth N]
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser, SUPPRESS
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
+import httpx
+
+from d2wiki.notion.models import NotionBlock
+from d2wiki.notion.wrapper import D2NotionWrapper
+from .mirror_memory import block, notion_id, rich_text, user
+
+CHUNK_SIZE = 16 * 1024      # bytes per network read.
+
+
+def child(i: int, segments: int, parent: int = 0, has_children: bool = False) -> dict[str, Any]:
+    """
+    :return: wide paragraph block, with many annotated rich text segments.
+    """
+    return {
+        "object": "block",
+        "id": notion_id(i),
+        "parent": {"type": "block_id", "block_id": notion_id(parent)},
+        "type": "paragraph",
+        "created_time": "2022-08-01T00:00:00.000Z",
+        "created_by": user(1),
+        "last_edited_time": "2022-08-02T00:00:00.000Z",
+        "last_edited_by": user(1),
+        "archived": False,
+        "has_children": has_children,
+        "paragraph": {
+            "rich_text": [rich_text(f"문단 {i} 조각 {j} " * 4, "yellow" if j % 3 else "default", j % 2 == 0)
+                          for j in range(segments)],
+            "color": "default"
+        }
+    }
+
+
+def body(results: list[dict[str, Any]], page: int, pages: int) -> bytes:
+    return json.dumps({
+        "object": "list",
+        "results": results,
+        "next_cursor": str(page + 1) if page + 1 < pages else None,
+        "has_more": page + 1 < pages,
+        "type": "block",
+        "block": {}
+    }, ensure_ascii=False).encode()
+
+
+def bodies(pages: int, blocks: int, segments: int, depth: int = 0) -> dict[str, list[bytes]]:
+    """
+    :return: {parent id: response bodies of each children page, linked by next_cursor}
+             First block of each level up to depth has a page of child blocks.
+    """
+    res = {notion_id(0): [
+        body([child(1 + p * blocks + i, segments, has_children=depth > 0 and p == i == 0) for i in range(blocks)], p, pages)
+        for p in range(pages)
+    ]}
+    parent = 1
+    for level in range(1, depth + 1):
+        first = 1 + pages * blocks + (level - 1) * blocks
+        res[notion_id(parent)] = [body([
+            child(first + i, segments, parent, has_children=level < depth and i == 0) for i in range(blocks)
+        ], 0, 1)]
+        parent = first
+    return res
+
+
+async def walk(nc: D2NotionWrapper, parent: NotionBlock) -> int:
+    """
+    List child blocks depth-first, keeping nothing.
+    :return: number of blocks listed.
+    """
+    count = 0
+    async with aclosing(nc.iter_children(parent)) as blocks:
+        async for b in blocks:
+            count += 1
+            if b.has_children:
+                count += await walk(nc, b)
+    return count
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """
+    Response body arriving in chunks, yielding to the event loop between them like a socket read.
+    """
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for i in range(0, len(self.body), CHUNK_SIZE):
+            await asyncio.sleep(0)
+            yield self.body[i:i + CHUNK_SIZE]
+
+
+async def stall_monitor(stalls: list[float]) -> None:
+    """
+    Record the longest time event loop couldn't run this task.
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        stalls[0] = max(stalls[0], time.perf_counter() - started)
+
+
+async def run(stream: bool, trees: dict[str, list[bytes]]) -> dict[str, float]:
+    nc = D2NotionWrapper({"token": "benchmark", "stream_blocks": stream, "http": {"http2": False}})
+    if stream and not nc.stream_blocks:
+        raise SystemExit("Streaming decode needs 'ijson' package.")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        parent_id = request.url.path.split("/")[-2]
+        body = trees[parent_id][int(request.url.params.get("start_cursor", 0))]
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, stream=ChunkedBody(body))
+
+    for session in nc.sessions.sessions:
+        session.http.client._transport = httpx.MockTransport(handler)
+
+    parent = block(nc, 0)
+    stalls = [0.0]
+    monitor = asyncio.create_task(stall_monitor(stalls))
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = await walk(nc, parent)      # consumer keeps nothing, so memory only holds what decoding needs.
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    monitor.cancel()
+    await nc.aclose()
+    return {
+        "blocks": count,
+        "seconds": elapsed,
+        "peak_traced_mb": peak / 2 ** 20,
+        "max_stall_ms": stalls[0] * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5, help="number of children pages.")
+    parser.add_argument("--blocks", type=int, default=100, help="blocks per page (Notion returns at most 100).")
+    parser.add_argument("--segments", type=int, default=40, help="rich text segments per block.")
+    parser.add_argument("--depth", type=int, default=8, help="levels of nested blocks in deep case.")
+    parser.add_argument("--mode", choices=("buffered", "streaming"), help=SUPPRESS)    # internal : run one mode.
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        trees = bodies(args.pages, args.blocks, args.segments, args.depth)
+        print(json.dumps(asyncio.run(run(args.mode == "streaming", trees))))
+        return
+
+    print(f"{'case':<9}{'mode':<12}{'blocks':>8}{'seconds':>9}{'peak RSS MB':>13}{'peak traced MB':>16}{'max stall ms':>14}")
+    for case, depth in (("shallow", 0), ("deep", args.depth)):
+        for mode in ("buffered", "streaming"):
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.block_stream", "--mode", mode, "--pages", str(args.pages),
+                 "--blocks", str(args.blocks), "--segments", str(args.segments), "--depth", str(depth)],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(f"{case:<9}{mode:<12}skipped : {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(proc.stdout)
+            print(f"{case:<9}{mode:<12}{r['blocks']:>8}{r['seconds']:>9.2f}{r['peak_rss_mb']:>13.1f}"
+                  f"{r['peak_traced_mb']:>16.1f}{r['max_stall_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
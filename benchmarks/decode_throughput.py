@@ -0,0 +1,127 @@
+"""
+Decode throughput benchmark : rows/s of parsing a database query page, hand-walked vs schema-compiled decoder.
+Usage : python -m benchmarks.decode_throughput [--rows N] [--repeat N]
+"""
+from __future__ import annotations
+
+import logging
+import timeit
+from argparse import ArgumentParser
+from typing import Any, Callable
+
+from d2wiki.notion.models import D2ElementalWell, D2ExoticArmor, D2Perk, D2JsonModel, RichText, flat_rich_text
+from d2wiki.notion.wrapper import D2NotionRoute, D2NotionWrapper
+from d2wiki.notion.wrapper.schema import compile_decoder
+from .mirror_memory import notion_id, rich_text
+
+
+def title(content: str) -> dict[str, Any]:
+    return {"id": "title", "type": "title", "title": [rich_text(content)]}
+
+
+def text(*contents: str) -> dict[str, Any]:
+    return {"id": "text", "type": "rich_text", "rich_text": [rich_text(c) for c in contents]}
+
+
+def select(name: str) -> dict[str, Any]:
+    return {"id": "select", "type": "select", "select": {"id": "option", "name": name, "color": "default"}}
+
+
+def page(i: int, properties: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "object": "page",
+        "id": notion_id(i),
+        "last_edited_time": "2022-08-02T00:00:00.000Z",
+        "url": f"https://www.notion.so/{notion_id(i).replace('-', '')}",
+        "icon": {"type": "file", "file": {"url": f"https://example.com/{i}.png", "expiry_time": ""}},
+        "properties": properties
+    }
+
+
+def schema(properties: dict[str, Any]) -> dict[str, Any]:
+    """
+    :return: database schema whose properties have the same types as row properties.
+    """
+    res = {}
+    for name, prop in properties.items():
+        res[name] = {"id": prop["id"], "name": name, "type": prop["type"], prop["type"]: {}}
+        if prop["type"] == "select":
+            res[name]["select"] = {"options": [{"name": prop["select"]["name"]}]}
+    return res
+
+
+ROWS: dict[str, Callable[[int], dict[str, Any]]] = {
+    D2NotionRoute.Perks.PerkRow1: lambda i: page(i, {
+        "이름": title(f"특성 {i}"),
+        "설명": text("재장전 속도가 ", "크게", " 증가합니다.")
+    }),
+    D2NotionRoute.CombatStyleMods.ElementalWells: lambda i: page(i, {
+        "이름": title(f"원소 샘 {i}"),
+        "원소": select("태양"),
+        "분류": select("생성"),
+        "에너지": {"id": "number", "type": "number", "number": i % 5},
+        "설명": text("원소 샘을 생성합니다. " * 4),
+        "각주": text("각주")
+    }),
+    D2NotionRoute.Exotics.Armors: lambda i: page(i, {
+        "이름": title(f"경이 방어구 {i}"),
+        "직업": select("헌터"),
+        "부위": select("머리"),
+        "경이 특성": text(f"경이 특성 {i}")
+    })
+}
+
+
+def hand_walk(nc: D2NotionWrapper) -> dict[str, Callable[[dict[str, Any]], D2JsonModel]]:
+    """
+    :return: route -> previous per-row parser, which walked every property path by hand.
+    """
+    def flat(values: list[dict[str, Any]]) -> str:
+        # previous parser passed raw json to flat_rich_text, which only works on RichText objects.
+        return flat_rich_text([RichText.from_json(**v) for v in values])
+
+    def icon(p: dict[str, Any]) -> str | None:
+        return p["icon"]["file"]["url"] if p.get("icon") is not None else None
+
+    return {
+        D2NotionRoute.Perks.PerkRow1: lambda p: D2Perk.from_json(
+            nc=nc, _id=p["id"], name=p["properties"]["이름"]["title"],
+            description=p["properties"]["설명"]["rich_text"], page_url=p["url"], img_url=icon(p)
+        ),
+        D2NotionRoute.CombatStyleMods.ElementalWells: lambda p: D2ElementalWell.from_json(
+            nc=nc, _id=p["id"], name=flat(p["properties"]["이름"]["title"]),
+            element=p["properties"]["원소"]["select"]["name"], mod_type=p["properties"]["분류"]["select"]["name"],
+            cost=p["properties"]["에너지"]["number"],
+            description=flat(p["properties"]["설명"]["rich_text"]),
+            footer=flat(p["properties"]["각주"]["rich_text"]), page_url=p["url"], img_url=icon(p)
+        ),
+        D2NotionRoute.Exotics.Armors: lambda p: D2ExoticArmor.from_json(
+            nc=nc, _id=p["id"], name=p["properties"]["이름"]["title"],
+            guardian_class=p["properties"]["직업"]["select"]["name"], category=p["properties"]["부위"]["select"]["name"],
+            exotic_perk_name=p["properties"]["경이 특성"]["rich_text"], page_url=p["url"], img_url=icon(p)
+        )
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="rows per query page (Notion returns at most 100).")
+    parser.add_argument("--repeat", type=int, default=200, help="number of pages decoded per measurement.")
+    args = parser.parse_args()
+
+    nc = D2NotionWrapper({"token": "benchmark"})
+    logger = logging.getLogger("d2wiki.notion")
+    old = hand_walk(nc)
+    print(f"{'model':<18}{'hand ms/page':>14}{'compiled ms/page':>18}{'compiled rows/s':>17}{'speedup':>9}")
+    for route, row in ROWS.items():
+        results = [row(i) for i in range(args.rows)]
+        model = nc.models[route]
+        decode = compile_decoder(nc, route, model, schema(results[0]["properties"]), logger)
+        hand = timeit.timeit(lambda: [old[route](p) for p in results], number=args.repeat) / args.repeat
+        compiled = timeit.timeit(lambda: [decode(p) for p in results], number=args.repeat) / args.repeat
+        print(f"{model.__name__:<18}{hand * 1000:>14.3f}{compiled * 1000:>18.3f}"
+              f"{args.rows / compiled:>17.0f}{hand / compiled:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
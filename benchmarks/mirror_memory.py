@@ -0,0 +1,112 @@
+"""
+Memory benchmark of mirrored rows : bytes per cached entity, as full models and in compact form.
+Models are stored in compact form only where it pays off. (see `D2JsonModel.compact_storage`)
+Usage : python -m benchmarks.mirror_memory [--rows N]
+"""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Any, Callable
+
+from d2wiki.notion.models import (
+    D2Perk, D2ElementalWell, D2ExoticWeapon, D2ExoticArmor, NotionParent, NotionDatabase, NotionBlock, freeze
+)
+from d2wiki.notion.wrapper import D2NotionWrapper
+
+
+def rich_text(content: str, color: str = "default", bold: bool = False) -> dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "plain_text": content,
+        "href": None,
+        "annotations": {
+            "color": color, "bold": bold, "italic": False, "strikethrough": False, "underline": False, "code": False
+        }
+    }
+
+
+def notion_id(i: int) -> str:
+    return f"{i:08x}-0000-4000-8000-{i:012x}"
+
+
+def user(i: int) -> dict[str, Any]:
+    return {"object": "user", "id": notion_id(i)}
+
+
+def block(nc: D2NotionWrapper, i: int) -> NotionBlock:
+    return NotionBlock.from_json(
+        nc=nc,
+        id=notion_id(i),
+        parent={"type": "page_id", "page_id": notion_id(0)},
+        type="paragraph",
+        created_time="2022-08-01T00:00:00.000Z",
+        created_by=user(1),
+        last_edited_time="2022-08-02T00:00:00.000Z",
+        last_edited_by=user(1),
+        archived=False,
+        has_children=False,
+        paragraph={"rich_text": [rich_text(f"문단 {i} "), rich_text("강조", "yellow", True)], "color": "default"}
+    )
+
+
+FACTORIES: dict[str, Callable[[D2NotionWrapper, int], Any]] = {
+    "D2Perk": lambda nc, i: D2Perk.from_json(
+        nc=nc, _id=notion_id(i), name=[rich_text(f"특성 {i}")],
+        description=[rich_text("재장전 속도가 "), rich_text("크게", "green", True), rich_text(" 증가합니다.")]
+    ),
+    "D2ElementalWell": lambda nc, i: D2ElementalWell.from_json(
+        nc=nc, _id=notion_id(i), name=f"원소 샘 {i}", element="태양", mod_type="생성", cost=i % 5,
+        description="원소 샘을 생성합니다. " * 4, img_url=None
+    ),
+    "D2ExoticWeapon": lambda nc, i: D2ExoticWeapon.from_json(
+        nc=nc, _id=notion_id(i), name=f"경이 무기 {i}", exotic_perk_name=f"경이 특성 {i}",
+        description="처치 시 재장전 속도가 증가합니다. " * 4
+    ),
+    "D2ExoticArmor": lambda nc, i: D2ExoticArmor.from_json(
+        nc=nc, _id=notion_id(i), name=[rich_text(f"경이 방어구 {i}")], guardian_class="헌터", category="머리",
+        exotic_perk_name=[rich_text(f"경이 특성 {i}", "yellow", True)]
+    ),
+    "NotionParent": lambda nc, i: NotionParent.from_json(nc=nc, type="page_id", page_id=notion_id(i)),
+    "NotionDatabase": lambda nc, i: NotionDatabase.from_json(nc=nc, id=notion_id(i)),
+    "NotionBlock": block
+}
+
+
+def measure(nc: D2NotionWrapper, factory: Callable[[D2NotionWrapper, int], Any], rows: int) -> tuple[int, int]:
+    """
+    :return: bytes retained by rows as full models, and as compact rows once models are dropped.
+    """
+    gc.collect()
+    base = tracemalloc.get_traced_memory()[0]
+    models = [factory(nc, i) for i in range(rows)]
+    gc.collect()
+    model_bytes = tracemalloc.get_traced_memory()[0] - base
+    compacts = [freeze(m) for m in models]
+    del models
+    gc.collect()
+    compact_bytes = tracemalloc.get_traced_memory()[0] - base
+    del compacts
+    return model_bytes, compact_bytes
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000, help="number of entities per model.")
+    args = parser.parse_args()
+
+    nc = D2NotionWrapper({"token": "benchmark"})
+    tracemalloc.start()
+    print(f"{'model':<16}{'model B/row':>14}{'compact B/row':>16}{'saved':>8}{'stored':>10}")
+    for name, factory in FACTORIES.items():
+        model_bytes, compact_bytes = measure(nc, factory, args.rows)
+        stored = "compact" if getattr(factory(nc, 0), "compact_storage", False) else "as-is"
+        print(f"{name:<16}{model_bytes / args.rows:>14.0f}{compact_bytes / args.rows:>16.0f}"
+              f"{1 - compact_bytes / model_bytes:>8.0%}{stored:>10}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,160 @@
 import json
-from typing import Any, Optional, List
+from hashlib import sha256
+from os import path
+from typing import Any, Optional, List, Final
 
 from discord import Bot, ApplicationCommand
 
+from d2wiki.utils.importtime import ImportTimer
 from d2wiki.utils.log import get_logger
 
+COMMAND_CACHE_PATH: Final[str] = "./command_cache.json"
+
+
+def command_key(command: ApplicationCommand) -> str:
+    """
+    Key of application command in command cache. Commands of different types may share same name.
+    """
+    return f"{command.type}:{command.name}"
+
+
+def command_hash(command: ApplicationCommand) -> str:
+    """
+    Hash of application command payload, to detect commands changed since last registration.
+    """
+    return sha256(json.dumps(command.to_dict(), sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
 
 class D2WikiBot(Bot):
     """
     D2Wiki Bot Class.
     """
 
-    async def register_command(self, command: ApplicationCommand, force: bool = True,
+    async def register_command(self, command: ApplicationCommand, force: bool = False,
                                guild_ids: Optional[List[int]] = None) -> None:
-        return await super(D2WikiBot, self).sync_commands([command], force=force, guild_ids=guild_ids)
+        if guild_ids is not None or command.guild_ids is not None:
+            return await super(D2WikiBot, self).sync_commands([command], force=force, guild_ids=guild_ids)
+        return await self.sync_changed_commands([command], force=force)
+
+    def load_command_cache(self) -> dict[str, dict[str, Any]] | None:
+        """
+        Load cached payload hashes and ids of registered global commands.
+        :return: {command key: {"hash": ..., "id": ...}}, or None if cache is missing or made by another application.
+        """
+        if not path.exists(COMMAND_CACHE_PATH):
+            return None
+        with open(COMMAND_CACHE_PATH, mode="rt", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache["commands"] if cache.get("application_id") == self.application_id else None
+
+    def save_command_cache(self) -> None:
+        """
+        Save payload hashes and ids of registered global commands.
+        """
+        commands = {
+            command_key(cmd): {"hash": command_hash(cmd), "id": cmd.id}
+            for cmd in self.pending_application_commands if cmd.guild_ids is None and cmd.id is not None
+        }
+        with open(COMMAND_CACHE_PATH, mode="wt", encoding="utf-8") as f:
+            json.dump({"application_id": self.application_id, "commands": commands}, f, ensure_ascii=False, indent=2)
+
+    async def sync_changed_commands(self, commands: Optional[List[ApplicationCommand]] = None, force: bool = False) -> None:
+        """
+        Register only global commands whose payload changed since last registration.
+        Registered commands are cached in COMMAND_CACHE_PATH. Without cache, commands are synced with Discord once
+        and cache is refreshed from the result. Delete the cache file to force a full sync.
+        :param commands: commands to register. Every pending command if None, and then stale commands are deleted.
+        :param force: register commands even if their payload is unchanged.
+        """
+        cache = self.load_command_cache()
+        pending = self.pending_application_commands if commands is None else commands
+        if cache is None or self.debug_guilds or any(cmd.guild_ids is not None for cmd in pending):
+            # Guild commands are not cached, so leave them to full sync.
+            await super(D2WikiBot, self).sync_commands()
+            self.save_command_cache()
+            self.logger.info("Synced every application command, and refreshed command cache.")
+            return
+
+        changed: list[str] = []
+        for cmd in pending:
+            cached = cache.pop(command_key(cmd), None)
+            if cached is not None and cached["hash"] == command_hash(cmd) and not force:
+                cmd.id = str(cached["id"])     # cache written by older versions holds int ids.
+            else:
+                registered = await self.http.upsert_global_command(self.application_id, cmd.to_dict())
+                cmd.id = str(registered["id"])     # py-cord keys commands by id string, as interactions carry it.
+                changed.append(cmd.name)
+            self._application_commands[cmd.id] = cmd
+
+        if commands is None:
+            for stale in cache.values():
+                await self.http.delete_global_command(self.application_id, stale["id"])
+        self.save_command_cache()
+        self.logger.info(
+            f"Registered {len(changed)} changed application commands {changed}"
+            + (f", deleted {len(cache)} stale commands." if commands is None else ".")
+        )
+
+    async def on_connect(self):
+        if self.auto_sync_commands:
+            await self.sync_changed_commands()
 
     def __init__(self):
         super().__init__(owner_id=280855156608860160)
         with open("./config.json", mode="rt", encoding="utf-8") as f:
             self.config: dict[str, Any] = json.load(f)
         self.logger = get_logger("d2wiki", stream=True, file=True)
+        self.import_timer: ImportTimer | None = None
+        self.reloading: bool = False                            # whether plugins are being reloaded now.
+        self.plugin_states: dict[str, dict[str, Any]] = {}      # plugin name -> state handed off on reload.
+
+    def load_plugins(self) -> ImportTimer:
+        """
+        Load every plugin in config, measuring import time of each module.
+        Warns if total import time exceeds `import_budget_ms` in config.
+        Plugins are imported eagerly on purpose : application commands are defined by plugin classes,
+        and `sync_changed_commands()` deletes every registered command missing from pending commands on connect.
+        A plugin loaded on first use would have its commands deleted before anyone could use them.
+        Import time is saved inside plugins instead, as notion models and wrapper modules are imported on first use.
+        :return: ImportTimer holding per-module import time breakdown.
+        """
+        with ImportTimer() as timer:
+            for plugin_path in self.config["plugins"].keys():       # path: plugin.name
+                with timer.measure(f"d2wiki.plugins.{plugin_path}"):
+                    self.load_extension(f"d2wiki.plugins.{plugin_path}")
+        self.logger.info(f"Loaded plugins in {timer.total * 1000:.1f}ms.\n{timer.report()}")
+        budget: float | None = self.config.get("import_budget_ms")
+        if budget is not None and timer.total * 1000 > budget:
+            self.logger.warning(f"Plugin import time {timer.total * 1000:.1f}ms exceeded budget {budget}ms!")
+        return timer
+
+    def reload_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        """
+        Reload extension, letting plugins hand off their state to the replacing plugins.
+        State left unadopted by the replacing plugin is closed.
+        """
+        self.reloading = True
+        try:
+            return super(D2WikiBot, self).reload_extension(name, package=package)
+        finally:
+            self.reloading = False
+            for state in self.plugin_states.values():
+                for leftover in state.values():
+                    if (aclose := getattr(leftover, "aclose", None)) is not None:
+                        self.loop.create_task(aclose())
+            self.plugin_states.clear()
 
     def run(self):
-        for plugin_path in self.config["plugins"].keys():       # path: plugin.name
-            self.load_extension(f"d2wiki.plugins.{plugin_path}")
+        self.import_timer = self.load_plugins()
         super().run(self.config.pop("token"))
 
+    async def close(self):
+        # Close resources of plugins (http connection pools...) before event loop stops.
+        for cog in tuple(self.cogs.values()):
+            if (aclose := getattr(cog, "aclose", None)) is not None:
+                await aclose()
+        await super(D2WikiBot, self).close()
+
     async def on_ready(self):
         self.logger.info("D2Wiki Online 🟢")
         await self.application_info()   # fetch self info.
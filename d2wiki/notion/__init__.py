@@ -1,6 +1,19 @@
 """
 Destiny2 Notion <-> Discord Bot integration plugin.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .wrapper import D2NotionWrapper
-from . import models
+if TYPE_CHECKING:
+    from .wrapper import D2NotionWrapper
+    from . import models
+
+
+def __getattr__(name: str):
+    # wrapper pulls notion_client & httpx, so load it only when used.
+    match name:
+        case "D2NotionWrapper":
+            return import_module(".wrapper", __name__).D2NotionWrapper
+        case "models":
+            return import_module(".models", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,83 @@
-from .base import *
-from .notion_link import *
-from .rich_text import *
-from .notion_color import *
-from .notion_emoji import *
-from .notion_file import *
-from .notion_user import *
-from .notion_block import *
-from .notion_page import *
-from .notion_database import *
-from .notion_parent import *
-from .elements import *
-from .elemental_well import *
-from .weapon import *
-from .armor_category import *
-from .guardian_class import *
-from .exotic import *
-from .weapon_perk import *
+"""
+Notion & Destiny2 models.
+Submodules are imported lazily on first attribute access, so importing this package doesn't load every model.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = base.__all__ + rich_text.__all__ + elements.__all__ + elemental_well.__all__ + weapon.__all__ + armor_category.__all__ + guardian_class.__all__ + exotic.__all__ + notion_page.__all__ + notion_database.__all__ + notion_block.__all__ + notion_link.__all__
+# name -> submodule defining it
+_EXPORTS: dict[str, str] = {
+    "D2JsonModel": "base",
+    "PropertyField": "base",
+    "NotionLink": "notion_link",
+    "flat_rich_text": "rich_text",
+    "wrap_diff": "rich_text",
+    "RichText": "rich_text",
+    "ansi_colorize": "rich_text",
+    "NotionColor": "notion_color",
+    "NotionEmoji": "notion_emoji",
+    "NotionFileType": "notion_file",
+    "NotionFileProperty": "notion_file",
+    "NotionExternalProperty": "notion_file",
+    "NotionFile": "notion_file",
+    "PartialNotionUser": "notion_user",
+    "NotionUser": "notion_user",
+    "NotionBlockType": "notion_block",
+    "NotionBlock": "notion_block",
+    "RenderBudget": "notion_block",
+    "NotionPage": "notion_page",
+    "NotionDatabase": "notion_database",
+    "NotionParentType": "notion_parent",
+    "NotionParent": "notion_parent",
+    "D2Element": "elements",
+    "D2ElementalWellModType": "elemental_well",
+    "D2ElementalWell": "elemental_well",
+    "D2WeaponAmmo": "weapon",
+    "D2WeaponSlot": "weapon",
+    "D2WeaponCategory": "weapon",
+    "D2ArmorCategory": "armor_category",
+    "D2GuardianClass": "guardian_class",
+    "D2ExoticWeapon": "exotic",
+    "D2ExoticArmor": "exotic",
+    "D2Perk": "weapon_perk",
+    "compact_class": "compact",
+    "freeze": "compact",
+    "thaw": "compact",
+}
+
+__all__ = tuple(_EXPORTS.keys())
+
+if TYPE_CHECKING:
+    from .base import *
+    from .notion_link import *
+    from .rich_text import *
+    from .notion_color import *
+    from .notion_emoji import *
+    from .notion_file import *
+    from .notion_user import *
+    from .notion_block import *
+    from .notion_page import *
+    from .notion_database import *
+    from .notion_parent import *
+    from .elements import *
+    from .elemental_well import *
+    from .weapon import *
+    from .armor_category import *
+    from .guardian_class import *
+    from .exotic import *
+    from .weapon_perk import *
+    from .compact import *
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value     # cache, so next access doesn't go through __getattr__.
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals().keys()) + list(__all__))
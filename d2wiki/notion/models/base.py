@@ -1,17 +1,32 @@
 from __future__ import annotations
 from abc import abstractmethod
+from enum import Enum
 
 import attr
 from discord import Embed
 
 from d2wiki.types import JsonSerializable
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar, Literal, Type
 
 if TYPE_CHECKING:
     from ..wrapper import D2NotionWrapper
 
 
-__all__ = ("D2JsonModel", )
+__all__ = ("PropertyField", "D2JsonModel")
+
+
+@attr.s(slots=True, frozen=True)
+class PropertyField:
+    """
+    Manifest entry mapping a model field to a Notion database property.
+    """
+    field: str = attr.ib()          # name of the model field.
+    property: str = attr.ib()       # name of the Notion property.
+    type: Literal["title", "rich_text", "select", "number"] = attr.ib()     # Notion property type.
+    # how value is converted : "plain" text, "rich" text (list of RichText), or Enum class of select options.
+    convert: Literal["plain", "rich", "number"] | Type[Enum] = attr.ib(default="plain")
+    # optional property which is missing from database schema, or empty in a row, is decoded as None.
+    optional: bool = attr.ib(default=False)
 
 
 @attr.s
@@ -20,6 +35,11 @@ class D2JsonModel(JsonSerializable):
     Base class of D2 Model from Notion API response.
     """
     nc: D2NotionWrapper = attr.ib(repr=False, eq=False, hash=False)
+    # Notion properties this model is decoded from, if it is a database row model.
+    manifest: ClassVar[tuple[PropertyField, ...]] = ()
+    # whether cache and mirror layers store this model in compact form. (see `freeze()`)
+    # Only models holding rich text or nested objects get noticeably smaller, others are stored as-is.
+    compact_storage: ClassVar[bool] = False
 
     @property
     @abstractmethod
@@ -29,3 +49,27 @@ class D2JsonModel(JsonSerializable):
         :return: discord.Embed object or None if this model is not embeddable.
         """
         ...
+
+    @property
+    def search_text(self) -> str:
+        """
+        Return plain text of this model for the local full-text search index.
+        :return: plain text to index, or empty string if this model is not searchable.
+        """
+        return ""
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether every field of this model is resolved.
+        Partial models, resolved short of time, are not kept as up-to-date in local mirror.
+        :return: True if model is complete.
+        """
+        return True
+
+    async def resolve(self) -> D2JsonModel:
+        """
+        Resolve fields which can't be filled from database row itself, and need extra Notion API calls.
+        :return: model itself for method chaining.
+        """
+        return self
@@ -0,0 +1,83 @@
+"""
+Compact storage form of models, for cache and mirror layers.
+"""
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, TYPE_CHECKING
+
+import attr
+
+from .base import D2JsonModel
+from .rich_text import RichText, RichTextAnnotations
+
+if TYPE_CHECKING:
+    from ..wrapper import D2NotionWrapper
+
+__all__ = ("compact_class", "freeze", "thaw")
+
+# Fields linking to other full models, which would form reference cycles. They are not stored,
+# and rebuilt models retrieve their targets again on demand. (ex: `NotionBlock.full_parent()`)
+LINK_FIELDS: frozenset[str] = frozenset({"parent_ref"})
+# Immutable instances which are already shared, so storing them as-is costs nothing.
+SHARED_TYPES: tuple[type, ...] = (RichTextAnnotations, )
+
+_COMPACT_CLASSES: dict[type, type] = {}     # model class -> compact class
+
+
+def compact_class(cls: type) -> type:
+    """
+    Return frozen, slotted compact class of attrs model class, creating it on first use.
+    Compact class has every public init field of the model, except `nc` back-reference and links to other models.
+    Private fields only cache other full models, so they are dropped and refilled on demand.
+    :param cls: attrs model class.
+    :return: compact class, whose `model` class attribute is the model class.
+    """
+    compact = _COMPACT_CLASSES.get(cls)
+    if compact is None:
+        names = [f.name for f in attr.fields(cls) if f.init and f.name != "nc" and not f.name.startswith("_") and f.name not in LINK_FIELDS]
+        compact = attr.make_class(
+            f"Compact{cls.__name__}", {name: attr.ib() for name in names}, slots=True, frozen=True
+        )
+        compact.model = cls
+        _COMPACT_CLASSES[cls] = compact
+    return compact
+
+
+def freeze(value: Any) -> Any:
+    """
+    Convert model into its compact form. Lists become tuples, and links to other models are dropped.
+    :param value: model, or any value of its fields.
+    :return: compact form of the value.
+    """
+    if value is None or isinstance(value, (str, int, float, Enum, SHARED_TYPES)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(map(freeze, value))
+    if attr.has(type(value)):
+        return compact_class(type(value))(**{
+            name: freeze(getattr(value, name)) for name in attr.fields_dict(compact_class(type(value))).keys()
+        })
+    return value    # datetime, raw json, etc.
+
+
+def thaw(value: Any, nc: D2NotionWrapper) -> Any:
+    """
+    Rebuild model from its compact form.
+    Links to other models are left to their defaults, to be retrieved again on demand.
+    :param value: compact form made by `freeze()`.
+    :param nc: notion wrapper to attach to rebuilt models.
+    :return: rebuilt model or value.
+    """
+    if isinstance(value, tuple):
+        return [thaw(v, nc) for v in value]
+    model: type | None = getattr(type(value), "model", None)
+    if model is None:
+        return value
+    fields = {name: thaw(v, nc) for name, v in attr.asdict(value, recurse=False).items()}
+    if issubclass(model, D2JsonModel):
+        fields["nc"] = nc
+    obj = model(**fields)
+    if isinstance(obj, RichText):
+        setattr(obj, obj.type.value, obj.data)      # same as RichText.from_json
+    return obj
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import cast, TYPE_CHECKING
+from typing import cast, ClassVar, TYPE_CHECKING
 
 import attr
 from discord import Embed
 
 from d2wiki.types import JSON, JSON_VALUES
 from d2wiki.utils.functional import cache_first_res
-from .base import D2JsonModel
+from .base import D2JsonModel, PropertyField
 from .rich_text import wrap_diff
 from .elements import D2Element
 
@@ -40,6 +40,14 @@ class D2ElementalWell(D2JsonModel):
     page_url: str = attr.ib(repr=False, eq=False, hash=True)
     footer: str | None = attr.ib(default=None, repr=False, eq=False, hash=False)
     img_url: str | None = attr.ib(default=None, repr=False, eq=False, hash=False)
+    manifest: ClassVar[tuple[PropertyField, ...]] = (
+        PropertyField("name", "이름", "title"),
+        PropertyField("element", "원소", "select", D2Element),
+        PropertyField("mod_type", "분류", "select", D2ElementalWellModType),
+        PropertyField("cost", "에너지", "number", "number"),
+        PropertyField("description", "설명", "rich_text"),
+        PropertyField("footer", "각주", "rich_text", optional=True)
+    )
 
     @classmethod
     def from_json(cls, nc: D2NotionWrapper, _id: str, **json: JSON_VALUES) -> D2ElementalWell:
@@ -71,6 +79,10 @@ class D2ElementalWell(D2JsonModel):
     def full_description(self) -> str:
         return f"{self.description}\n\n{wrap_diff(self.footer)}" if self.footer is not None else self.description
 
+    @property
+    def search_text(self) -> str:
+        return f"{self.description}\n{self.footer}" if self.footer is not None else self.description
+
     @property
     # @cache_first_res
     def embed(self) -> Embed:
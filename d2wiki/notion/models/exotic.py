@@ -1,25 +1,37 @@
 from __future__ import annotations
 
-from typing import cast
+import re
+from functools import cache
+from typing import cast, ClassVar
 
 import attr
 from discord import Embed, Color
 from typing import TYPE_CHECKING
 
 from d2wiki.types import JSON
-from .base import D2JsonModel
+from .base import D2JsonModel, PropertyField
 from .armor_category import D2ArmorCategory
 from .guardian_class import D2GuardianClass
-from .notion_block import NotionParagraph
-from .weapon import D2WeaponCategory, D2WeaponSlot
 from .rich_text import wrap_diff, ansi_colorize, RichText, flat_rich_text
 
 if TYPE_CHECKING:
     from ..wrapper import D2NotionWrapper
+    from .notion_block import RenderBudget
 
 __all__ = ("D2ExoticWeapon", "D2ExoticArmor")
 
 EXOTIC_COLOR = Color.from_rgb(205, 175, 45)
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@cache
+def description_budget() -> RenderBudget:
+    """
+    Render budget of "효과" embed field. Block models are imported on first use, not with exotic models.
+    :return: budget of top-level paragraphs.
+    """
+    from .notion_block import NotionBlockType, RenderBudget
+    return RenderBudget(types={NotionBlockType.PARAGRAPH}, chars=1024)
 
 
 @attr.s
@@ -29,12 +41,15 @@ class D2ExoticWeapon(D2JsonModel):
     """
     id: str = attr.ib(repr=True, eq=True, hash=True)    # notion id.
     name: str = attr.ib(repr=True, eq=True, hash=True)
-    category: D2WeaponCategory = attr.ib(repr=True, eq=True, hash=True)
     exotic_perk_name: str = attr.ib(repr=True, eq=True, hash=True)
-    weapon_slot: D2WeaponSlot = attr.ib(repr=True, eq=True, hash=True)
     page_url: str = attr.ib(repr=False, eq=False, hash=False)
     description: str | None = attr.ib(default=None, repr=False, eq=False, hash=True)
     img_url: str | None = attr.ib(default=None, eq=False, hash=False)
+    manifest: ClassVar[tuple[PropertyField, ...]] = (
+        PropertyField("name", "이름", "title"),
+        PropertyField("exotic_perk_name", "경이 특성", "rich_text"),
+        PropertyField("description", "설명", "rich_text", optional=True)
+    )
 
     @classmethod
     def from_json(cls, nc: D2NotionWrapper, _id: str, **json: str) -> D2ExoticWeapon:
@@ -42,9 +57,7 @@ class D2ExoticWeapon(D2JsonModel):
             nc=nc,
             id=_id,
             name=json["name"],
-            category=D2WeaponCategory(json["category"]),
             exotic_perk_name=json["exotic_perk_name"],
-            weapon_slot=D2WeaponSlot(json["weapon_slot"]),
             description=json["description"],
             page_url=nc.get_shared_url(_id),
             img_url=json.get("img_url")
@@ -53,30 +66,28 @@ class D2ExoticWeapon(D2JsonModel):
     def to_json(self) -> JSON:
         return {
             "name": self.name,
-            "category": self.category.value,
             "exotic_perk_name": self.exotic_perk_name,
-            "weapon_slot": self.weapon_slot.value,
             "description": self.description,
             "page_url": self.page_url,
             "img_url": self.img_url
         }
 
+    @property
+    def search_text(self) -> str:
+        return f"{self.exotic_perk_name}\n{self.description or ''}"
+
     @property
     def embed(self) -> Embed:
         e = Embed(
             title=self.name,
             color=EXOTIC_COLOR
-        ).add_field(
-            name="무기군",
-            value=cast(str, self.category.value),
-            inline=True
         ).add_field(
             name="경이 특성",
             value=self.exotic_perk_name,
             inline=False
         ).add_field(
             name="효과",
-            value=wrap_diff(self.description),
+            value=wrap_diff(self.description) if self.description else "아직 작성중입니다.",
             inline=False
         ).add_field(
             name="노션에서 보기",
@@ -103,6 +114,13 @@ class D2ExoticArmor(D2JsonModel):
     page_url: str = attr.ib(repr=False, eq=False, hash=False)
     description: str | None = attr.ib(default=None, repr=False, eq=False, hash=True)
     img_url: str | None = attr.ib(default=None, eq=False, hash=False)
+    manifest: ClassVar[tuple[PropertyField, ...]] = (
+        PropertyField("name", "이름", "title", "rich"),
+        PropertyField("exotic_perk_name", "경이 특성", "rich_text", "rich"),
+        PropertyField("guardian_class", "직업", "select", D2GuardianClass),
+        PropertyField("category", "부위", "select", D2ArmorCategory)
+    )
+    compact_storage: ClassVar[bool] = True
 
     @classmethod
     def from_json(cls, nc: D2NotionWrapper, _id: str, **json: str | dict) -> D2ExoticArmor:
@@ -128,22 +146,29 @@ class D2ExoticArmor(D2JsonModel):
             "img_url": self.img_url
         }
 
+    async def resolve(self) -> D2ExoticArmor:
+        # description needs child blocks of the page, so leave it empty if interaction can't wait for them.
+        if not self.nc.has_time():
+            return self
+        return await self.resolve_description()
+
+    @property
+    def complete(self) -> bool:
+        return self.description is not None
+
     async def resolve_description(self) -> D2ExoticArmor:
-        print(f"Resolving description for {self.name}")
-        page = await self.nc.retrieve_page(self.id)
-        await page.retrieve_children()
-        # print(f"{self.name} 의 노션 페이지 내 자식 블록 개수 : {len(page.children)}")
-        # print(page.children)
-        self.description = "\n".join(map(
-            lambda b: ansi_colorize(b.data.rich_text),
-            filter(
-                lambda b: b.type.value == "paragraph",
-                page.children
-            )
-        ))
-        # print(f"resolved desc : \n{self.description}")
+        # only top-level paragraphs fitting in embed field are fetched. page object itself is not needed.
+        self.description = await self.nc.render_blocks(
+            self.id, description_budget(), lambda b: ansi_colorize(b.data.rich_text)
+        )
         return self
 
+    @property
+    def search_text(self) -> str:
+        # description is joined ansi codeblocks, so strip codeblock fences and escape sequences.
+        description = ANSI_ESCAPE.sub("", self.description or "").replace("```ansi", "").replace("```", "")
+        return f"{flat_rich_text(self.exotic_perk_name)}\n{description}"
+
     @property
     def embed(self) -> Embed:
         e = Embed(
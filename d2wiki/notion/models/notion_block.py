@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, ClassVar, cast
 
 import attr
 
@@ -12,14 +12,14 @@ from .base import D2JsonModel
 from .notion_color import NotionColor
 from .rich_text import RichText
 from .notion_user import PartialNotionUser
-from .notion_parent import NotionParent
+from .notion_parent import NotionParent, NotionParentType
 
 if TYPE_CHECKING:
     from ..wrapper import D2NotionWrapper
     from . import NotionPage
     BLOCK_PARENT_TYPE = NotionPage | NotionParent
 
-__all__ = ("NotionBlockType", "NotionBlock")
+__all__ = ("NotionBlockType", "NotionBlock", "RenderBudget")
 
 
 class NotionBlockType(Enum):
@@ -58,6 +58,17 @@ class NotionBlockType(Enum):
     CODE = "code"       # why this is not listed in docs?
 
 
+@attr.s(slots=True, frozen=True)
+class RenderBudget:
+    """
+    Limits of block contents to render, such as an embed field.
+    Block loader stops fetching pages and subtrees of blocks once the budget is met.
+    """
+    types: frozenset[NotionBlockType] = attr.ib(converter=frozenset)     # block types to render. Others are skipped.
+    depth: int = attr.ib(default=0)         # levels of nested children to render. 0 renders top-level blocks only.
+    chars: int = attr.ib(default=1024)      # maximum characters of rendered text, including separators.
+
+
 class NotionBlockData(JsonSerializable):
     """
     Base class of all types of Notion Block Data.
@@ -86,12 +97,87 @@ class NotionParagraph(NotionBlockData):
         }
 
 
+@attr.s
+class NotionSyncedBlock(NotionBlockData):
+    synced_from: str | None = attr.ib(repr=True, eq=False, hash=False)     # id of original block, None if this is original.
+
+    @classmethod
+    def from_json(cls, **json: JSON | None) -> NotionSyncedBlock:
+        return cls(
+            synced_from=None if json["synced_from"] is None else json["synced_from"]["block_id"]
+        )
+
+    def to_json(self) -> JSON:
+        return {
+            "synced_from": None if self.synced_from is None else {"type": "block_id", "block_id": self.synced_from}
+        }
+
+
+@attr.s
+class NotionLinkToPage(NotionBlockData):
+    type: NotionParentType = attr.ib(repr=True, eq=False, hash=False)     # page_id or database_id
+    target: str = attr.ib(repr=True, eq=False, hash=False)                # id of linked page or database.
+    TARGET_TYPES: ClassVar[frozenset[str]] = frozenset({NotionParentType.PAGE.value, NotionParentType.DATABASE.value})
+
+    @classmethod
+    def from_json(cls, **json: str) -> NotionLinkToPage:
+        return cls(
+            type=NotionParentType(json["type"]),
+            target=json[json["type"]]
+        )
+
+    def to_json(self) -> JSON:
+        return {
+            "type": self.type.value,
+            self.type.value: self.target
+        }
+
+
+@attr.s
+class NotionChildPage(NotionBlockData):
+    title: str = attr.ib(repr=True, eq=False, hash=False)     # id of child page is the id of this block.
+
+    @classmethod
+    def from_json(cls, **json: str) -> NotionChildPage:
+        return cls(
+            title=json["title"]
+        )
+
+    def to_json(self) -> JSON:
+        return {
+            "title": self.title
+        }
+
+
+@attr.s
+class NotionRawData(NotionBlockData):
+    """
+    Data of block types which have no model yet, kept as it is.
+    """
+    json: JSON = attr.ib(repr=False, eq=False, hash=False)
+
+    @classmethod
+    def from_json(cls, **json: JSON_VALUES) -> NotionRawData:
+        return cls(json=json)
+
+    def to_json(self) -> JSON:
+        return self.json
+
+
 def parse_notion_data(block_type: NotionBlockType, json: JSON_VALUES) -> NotionBlockData | None:
     match block_type:
         case NotionBlockType.PARAGRAPH:
             return NotionParagraph.from_json(**json)
+        case NotionBlockType.SYNCED_BLOCK:
+            return NotionSyncedBlock.from_json(**json)
+        case NotionBlockType.LINK_TO_PAGE:
+            if json["type"] not in NotionLinkToPage.TARGET_TYPES:
+                return NotionRawData.from_json(**json)     # links to other objects, such as comments, are not followed.
+            return NotionLinkToPage.from_json(**json)
+        case NotionBlockType.CHILD_PAGE:
+            return NotionChildPage.from_json(**json)
         case _:
-            return None
+            return NotionRawData.from_json(**json)
 
 
 @attr.define(slots=True)
@@ -107,7 +193,9 @@ class NotionBlock(D2JsonModel):
     has_children: bool = attr.ib(repr=True, eq=False, hash=False)
     children: list[NotionBlock] = attr.ib(repr=True, eq=False, hash=False)
     data: NotionBlockData = attr.ib(repr=True, eq=False, hash=False)
-    full_parent: BLOCK_PARENT_TYPE | None = attr.ib(init=True, repr=True, eq=False, hash=False)
+    # full object of parent, retrieved by `full_parent()` if it is not known yet.
+    parent_ref: BLOCK_PARENT_TYPE | None = attr.ib(default=None, repr=False, eq=False, hash=False)
+    compact_storage: ClassVar[bool] = True
 
     @classmethod
     def from_json(cls, _parent: BLOCK_PARENT_TYPE = None, _children: list[NotionBlock] = None, **json: str | bool | D2NotionWrapper | JSON) -> NotionBlock:
@@ -132,7 +220,7 @@ class NotionBlock(D2JsonModel):
             has_children=json["has_children"],
             children=[] if _children is None else _children,
             data=data,
-            full_parent=_parent
+            parent_ref=_parent
         )
 
     def to_json(self) -> JSON:
@@ -164,16 +252,16 @@ class NotionBlock(D2JsonModel):
         :param parent: Parent object of this NotionBlock. Either NotionPage or NotionBlock.
         :return: NotionBlock object itself for method chaining.
         """
-        self.__parent = parent
+        self.parent_ref = parent
         return self
 
     async def full_parent(self) -> BLOCK_PARENT_TYPE:
         """
         Return Full object of this block's parent.
         """
-        if self.__parent is None:
-            self.__parent = await self.parent.retrieve_parent()
-        return self.__parent
+        if self.parent_ref is None:
+            self.parent_ref = await self.parent.retrieve_parent()
+        return self.parent_ref
 
     async def retrieve_children(self) -> NotionBlock:
         """
@@ -1,6 +1,8 @@
 from enum import Enum, auto
 from typing import Any
 
+__all__ = ("NotionColor", )
+
 
 class NotionColor(Enum):
     """
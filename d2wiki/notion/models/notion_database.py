@@ -14,17 +14,20 @@ __all__ = ("NotionDatabase", )
 @attr.s
 class NotionDatabase(D2JsonModel):
     id: str = attr.ib(repr=True, eq=True, hash=True)
+    properties: JSON = attr.ib(factory=dict, repr=False, eq=False, hash=False)   # database schema. property name -> property object
 
     @classmethod
-    def from_json(cls, **json: str | D2NotionWrapper) -> NotionDatabase:
+    def from_json(cls, **json: str | D2NotionWrapper | JSON) -> NotionDatabase:
         return cls(
             nc=json["nc"],
             id=json["id"],
+            properties=json.get("properties", {})
         )
 
     def to_json(self) -> JSON:
         obj = {
-            "id": self.id
+            "id": self.id,
+            "properties": self.properties
         }
         return obj
 
@@ -15,21 +15,56 @@ from d2wiki.types import JSON, JsonSerializable
 __all__ = ("flat_rich_text", "wrap_diff", "RichText", "ansi_colorize")
 
 
-@attr.s(slots=True)
+ANSI_COLOR_MAPPING = {
+    NotionColor.GRAY: "30",
+    NotionColor.RED: "31",
+    NotionColor.GREEN: "32",
+    NotionColor.YELLOW: "33",
+    NotionColor.BLUE: "34",
+    NotionColor.PINK: "35",
+    NotionColor.DEFAULT: "37",
+    NotionColor.ORANGE_BACKGROUND: "41",
+    NotionColor.BLUE_BACKGROUND: "45",
+    NotionColor.GRAY_BACKGROUND: "44"
+}
+ANSI_DEFAULT: Final[str] = ANSI_COLOR_MAPPING[NotionColor.DEFAULT]
+ANSI_RESET: Final[str] = "[0m"
+
+
+@attr.s(slots=True, frozen=True)
 class RichTextAnnotations(JsonSerializable):
     """
     Rich Text Annotations.
+    Annotations are immutable flyweights shared by every rich text with the same combination,
+    so always create them through `RichTextAnnotations.intern()` or `from_json()`.
     """
     color: NotionColor = attr.ib(repr=True, eq=True, hash=True)
     bold: bool = attr.ib(default=False, repr=True, eq=True, hash=True)
     italic: bool = attr.ib(default=False, repr=True, eq=True, hash=True)
     strikethrough: bool = attr.ib(default=False, repr=True, eq=True, hash=True)
     underline: bool = attr.ib(default=False, repr=True, eq=True, hash=True)
-    code: bold = attr.ib(default=False, repr=True, eq=True, hash=True)
+    code: bool = attr.ib(default=False, repr=True, eq=True, hash=True)
+    ansi_prefix: str = attr.ib(init=False, repr=False, eq=False, hash=False)   # ansi escape sequence of this combination.
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, "ansi_prefix", f"[{self.get_ansi_format()}{ANSI_COLOR_MAPPING.get(self.color, ANSI_DEFAULT)}m")
+
+    @classmethod
+    def intern(cls, color: NotionColor, bold: bool = False, italic: bool = False, strikethrough: bool = False,
+               underline: bool = False, code: bool = False) -> RichTextAnnotations:
+        """
+        Return shared annotations of the combination, creating it on first use.
+        There are at most (number of colors) * 2^5 combinations, and only a handful of them are used in practice.
+        """
+        key = (color, bold, italic, strikethrough, underline, code)
+        annotations = _ANNOTATIONS.get(key)
+        if annotations is None:
+            annotations = _ANNOTATIONS[key] = cls(*key)
+        return annotations
 
     @classmethod
     def from_json(cls, **json: str | bool) -> RichTextAnnotations:
-        return cls(
+        return cls.intern(
             color=NotionColor(json["color"]),
             bold=json["bold"],
             italic=json["italic"],
@@ -61,6 +96,9 @@ class RichTextAnnotations(JsonSerializable):
         return fmt
 
 
+_ANNOTATIONS: dict[tuple[NotionColor, bool, bool, bool, bool, bool], RichTextAnnotations] = {}     # flyweight table
+
+
 class RichTextType(Enum):
     """
     Rich Text Type
@@ -113,22 +151,6 @@ def parse_rich_text_data(rich_text_type: RichTextType, json: JSON) -> RichTextDa
             return None
 
 
-ANSI_COLOR_MAPPING = {
-    NotionColor.GRAY: "30",
-    NotionColor.RED: "31",
-    NotionColor.GREEN: "32",
-    NotionColor.YELLOW: "33",
-    NotionColor.BLUE: "34",
-    NotionColor.PINK: "35",
-    NotionColor.DEFAULT: "37",
-    NotionColor.ORANGE_BACKGROUND: "41",
-    NotionColor.BLUE_BACKGROUND: "45",
-    NotionColor.GRAY_BACKGROUND: "44"
-}
-ANSI_DEFAULT: Final[str] = ANSI_COLOR_MAPPING[NotionColor.DEFAULT]
-ANSI_RESET: Final[str] = "[0m"
-
-
 @attr.s
 class RichText:
     """
@@ -170,12 +192,8 @@ class RichText:
         Returns ANSI color format of this rich text.
         :return: ansi formatted text of this rich text.
         """
-        ansi = f"[{self.annotations.get_ansi_format()}"
-        c = ANSI_COLOR_MAPPING.get(self.annotations.color)
-        # print(f"plain_text : {self.plain_text}, fmt : {ansi, c}")
-        ansi += c or ANSI_DEFAULT
-        # return ansi + "m" + self.plain_text + ANSI_RESET
-        return ansi + "m" + self.plain_text
+        # return self.annotations.ansi_prefix + self.plain_text + ANSI_RESET
+        return self.annotations.ansi_prefix + self.plain_text
 
 
 def parse_rich_text(rich_text: list[JSON]) -> list[RichText]:
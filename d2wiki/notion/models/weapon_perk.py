@@ -1,16 +1,18 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 import attr
 from discord import Embed
 
 from d2wiki.types import JSON
-from .base import D2JsonModel
+from .base import D2JsonModel, PropertyField
 from .weapon import D2WeaponCategory
 from .rich_text import wrap_diff, RichText, ansi_colorize, flat_rich_text
 
 if TYPE_CHECKING:
     from ..wrapper import D2NotionWrapper
 
+__all__ = ("D2Perk", )
+
 
 @attr.s
 class D2Perk(D2JsonModel):
@@ -23,6 +25,11 @@ class D2Perk(D2JsonModel):
     page_url: str = attr.ib(eq=True, hash=True)
     img_url: str | None = attr.ib(default=None, eq=False, hash=False)
     valid_weapons: list[D2WeaponCategory] = attr.ib(default=attr.Factory(list), eq=False, hash=False)
+    manifest: ClassVar[tuple[PropertyField, ...]] = (
+        PropertyField("name", "이름", "title", "rich"),
+        PropertyField("description", "설명", "rich_text", "rich")
+    )
+    compact_storage: ClassVar[bool] = True
 
     @classmethod
     def from_json(cls, nc: D2NotionWrapper, _id: str, **json: str | dict) -> D2Perk:
@@ -43,6 +50,10 @@ class D2Perk(D2JsonModel):
             "img_url": self.img_url
         }
 
+    @property
+    def search_text(self) -> str:
+        return flat_rich_text(self.description)
+
     @property
     # @cache_first_res
     def embed(self) -> Embed:
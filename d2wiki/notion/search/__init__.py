@@ -0,0 +1,8 @@
+"""
+Local search indexes over mirrored Notion rows.
+"""
+
+from .tokenizer import tokenize
+from .bm25 import BM25Index
+from .suggest import NameSuggester
+from .bloom import BloomFilter, NameFilter
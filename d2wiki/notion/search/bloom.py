@@ -0,0 +1,84 @@
+"""
+Bloom filter of known names, to answer guaranteed misses locally.
+"""
+from __future__ import annotations
+
+import math
+from hashlib import blake2b
+from typing import Iterable
+
+__all__ = ("BloomFilter", "NameFilter")
+
+
+class BloomFilter:
+    """
+    Plain bloom filter over str items.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.size: int = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))   # number of bits
+        self.hashes: int = max(1, round(self.size / capacity * math.log(2)))
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+        self.count: int = 0
+
+    def _indexes(self, item: str) -> Iterable[int]:
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))     # double hashing
+
+    def add(self, item: str) -> None:
+        for i in self._indexes(item):
+            self.bits[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(item))
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize name or query the same way Notion compares them on `contains` filter.
+    :param text: name or query.
+    :return: normalized text.
+    """
+    return text.strip().casefold()
+
+
+class NameFilter:
+    """
+    Bloom filter over every substring of known names.
+    Database queries use `contains` filter, so substrings are stored instead of full names.
+    A query which is not in this filter never matches any known name.
+    """
+    def __init__(self, names: Iterable[str], error_rate: float = 0.01):
+        names = [normalize(n) for n in names]
+        substrings = sum(len(n) * (len(n) + 1) // 2 for n in names)
+        self.bloom: BloomFilter = BloomFilter(substrings * 2, error_rate)   # leave room for names added later.
+        self.max_length: int = 0
+        for name in names:
+            self.add(name)
+
+    @property
+    def saturated(self) -> bool:
+        return self.bloom.count > self.bloom.capacity
+
+    def add(self, name: str) -> None:
+        name = normalize(name)
+        self.max_length = max(self.max_length, len(name))
+        for i in range(len(name)):
+            for j in range(i + 1, len(name) + 1):
+                self.bloom.add(name[i:j])
+
+    def might_match(self, query: str) -> bool:
+        """
+        Check whether query may match any known name.
+        :param query: query typed by user.
+        :return: False if query surely matches no name. True otherwise.
+        """
+        query = normalize(query)
+        if len(query) > self.max_length:
+            return False
+        return query == "" or query in self.bloom
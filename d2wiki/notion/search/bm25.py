@@ -0,0 +1,84 @@
+"""
+Incremental BM25 full-text index.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+
+from .tokenizer import tokenize
+
+__all__ = ("BM25Index", )
+
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 index.
+    Documents can be added, replaced and removed one by one, so the index follows mirrored rows as they change.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1: float = k1
+        self.b: float = b
+        self._postings: dict[str, dict[str, int]] = {}      # term -> {doc_id: term frequency}
+        self._terms: dict[str, tuple[str, ...]] = {}        # doc_id -> unique terms of the document
+        self._lengths: dict[str, int] = {}                  # doc_id -> document length
+        self._total_length: int = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """
+        Add document into index. Existing document with same id is replaced.
+        :param doc_id: id of the document.
+        :param text: plain text of the document.
+        """
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._terms[doc_id] = tuple(counts.keys())
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: str) -> None:
+        """
+        Remove document from index. Does nothing if document is not indexed.
+        :param doc_id: id of the document.
+        """
+        if doc_id not in self._lengths:
+            return
+        for term in self._terms.pop(doc_id):
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        """
+        Search documents matching query.
+        :param query: query text.
+        :param limit: maximum number of results.
+        :return: list of (doc_id, score) tuples, ordered by score descending.
+        """
+        n = len(self._lengths)
+        if n == 0:
+            return []
+        avg_length = self._total_length / n or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
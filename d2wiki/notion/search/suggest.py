@@ -0,0 +1,150 @@
+"""
+Typo-tolerant name suggestion using symmetric delete (SymSpell) dictionary over jamo decomposed names.
+"""
+from __future__ import annotations
+
+import unicodedata
+from typing import Callable
+
+__all__ = ("to_jamo", "edit_distance", "SymSpell", "NameSuggester")
+
+
+def to_jamo(text: str) -> str:
+    """
+    Decompose hangul syllables into jamo, so edit distance is computed per consonant/vowel.
+    ('방어구' -> 'ㅂㅏㅇㅇㅓㄱㅜ' in conjoining jamo)
+    Whitespaces are removed and latin letters are lower-cased.
+    :param text: text to decompose.
+    :return: decomposed text.
+    """
+    return "".join(unicodedata.normalize("NFD", text.lower()).split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance between two strings.
+    :param a: first string.
+    :param b: second string.
+    :return: edit distance.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def deletes(word: str, distance: int) -> set[str]:
+    """
+    Generate every string made by deleting up to `distance` characters from word.
+    :param word: source word.
+    :param distance: maximum number of deleted characters.
+    :return: set of deleted variants, including the word itself.
+    """
+    res = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - res
+        res |= frontier
+    return res
+
+
+class SymSpell:
+    """
+    Symmetric delete dictionary for edit distance lookup.
+    Deleted variants of every word are precomputed, so lookup only touches words sharing a variant with the query.
+    """
+    def __init__(self, max_distance: int = 2):
+        self.max_distance: int = max_distance
+        self.variants: dict[str, set[str]] = {}     # deleted variant -> words
+        self.words: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str) -> None:
+        """
+        Add word into dictionary. Duplicated word is ignored.
+        :param word: word to add.
+        """
+        if word in self.words:
+            return
+        self.words.add(word)
+        for variant in deletes(word, self.max_distance):
+            self.variants.setdefault(variant, set()).add(word)
+
+    def search(self, word: str, max_distance: int | None = None) -> list[tuple[int, str]]:
+        """
+        Find words within max_distance from word.
+        :param word: word to look up.
+        :param max_distance: maximum edit distance, capped by the dictionary's max_distance.
+        :return: list of (distance, word) tuples, ordered by distance.
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        candidates: set[str] = set()
+        for variant in deletes(word, max_distance):
+            candidates |= self.variants.get(variant, set())
+        found: list[tuple[int, str]] = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            d = edit_distance(word, candidate)
+            if d <= max_distance:
+                found.append((d, candidate))
+        found.sort()
+        return found
+
+
+class NameSuggester:
+    """
+    Suggest entity ids whose name is close to the query.
+    """
+    def __init__(self, max_distance: int = 2):
+        self.dictionary: SymSpell = SymSpell(max_distance)
+        self.ids: dict[str, set[str]] = {}      # jamo key -> ids sharing the name
+        self.keys: dict[str, str] = {}          # id -> jamo key
+
+    def add(self, _id: str, name: str) -> None:
+        """
+        Add or rename entity.
+        :param _id: id of the entity.
+        :param name: name of the entity.
+        """
+        key = to_jamo(name)
+        if self.keys.get(_id) == key:
+            return
+        self.remove(_id)
+        self.keys[_id] = key
+        self.ids.setdefault(key, set()).add(_id)
+        self.dictionary.add(key)    # keys are never deleted from dictionary. Keys left without ids are skipped on lookup.
+
+    def remove(self, _id: str) -> None:
+        """
+        Remove entity. Does nothing if entity is not added.
+        :param _id: id of the entity.
+        """
+        key = self.keys.pop(_id, None)
+        if key is not None:
+            self.ids[key].discard(_id)
+
+    def suggest(self, query: str, limit: int = 5, max_distance: int | None = None,
+                accept: Callable[[str], bool] | None = None) -> list[str]:
+        """
+        Suggest ids of entities whose name is similar to query.
+        :param query: name typed by user.
+        :param limit: maximum number of suggestions.
+        :param max_distance: maximum jamo edit distance. Defaults to dictionary's max_distance.
+        :param accept: optional predicate to filter entity ids.
+        :return: list of entity ids, closest first.
+        """
+        res: list[str] = []
+        for _, word in self.dictionary.search(to_jamo(query), max_distance):
+            res.extend(sorted(filter(accept, self.ids[word]) if accept is not None else self.ids[word]))
+            if len(res) >= limit:
+                break
+        return res[:limit]
@@ -0,0 +1,51 @@
+"""
+Korean-aware tokenizer for local full-text search.
+"""
+from __future__ import annotations
+
+import re
+from typing import Final
+
+__all__ = ("tokenize", )
+
+WORD: Final[re.Pattern] = re.compile(r"[0-9a-z가-힣]+")
+HANGUL: Final[re.Pattern] = re.compile(r"[가-힣]")
+
+# Common postpositions (조사) attached to the end of korean words. Longer ones first.
+JOSA: Final[tuple[str, ...]] = (
+    "에서는", "으로는", "에게서", "에서", "으로", "에게", "까지", "부터", "보다", "처럼",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만"
+)
+
+
+def strip_josa(word: str) -> str:
+    """
+    Strip trailing postposition from korean word.
+    Stem should remain at least 2 characters long, so words like '증가' are kept as-is.
+    :param word: korean word.
+    :return: stem of the word.
+    """
+    for josa in JOSA:
+        if word.endswith(josa) and len(word) - len(josa) >= 2:
+            return word[:-len(josa)]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Tokenize text into search terms.
+    Korean words are stripped of their postposition and split into character bigrams in addition to the word itself,
+    since korean compound words ('재장전속도', '원소구체') are often written with or without spaces.
+    :param text: text to tokenize.
+    :return: list of terms. Duplicated terms are kept to count term frequency.
+    """
+    terms: list[str] = []
+    for word in WORD.findall(text.lower()):
+        if HANGUL.search(word) is None:
+            terms.append(word)
+            continue
+        word = strip_josa(word)
+        terms.append(word)
+        if len(word) > 2:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
@@ -3,3 +3,12 @@ Destiny2 Notion <-> Pycord integration.
 """
 
 from .client import D2NotionRoute, D2NotionWrapper
+from .mirror import D2NotionMirror, plain_name
+from .errors import NotionUnavailableError
+from .schema import SchemaError
+from .retry import RetryPolicy, retry_budget
+from .breaker import CircuitBreaker, CircuitOpenError
+from .deadline import Deadline, DeadlineExceededError, deadline, RESPONSE_TIMEOUT, DEFERRED_TIMEOUT
+from .sessions import NotionSession, NotionSessionPool
+from .columnar import ColumnarTable, Column, StringPool
+from .identity import IdentityMap
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from enum import Enum
+from time import monotonic
+from typing import Awaitable, Callable, TypeVar
+
+from d2wiki.types import JSON
+from .errors import NotionUnavailableError
+
+T = TypeVar("T")
+
+DEFAULT_BREAKER_CONFIG: JSON = {
+    "failure_threshold": 5,     # consecutive failed or slow calls which open the circuit.
+    "slow_call": 5.0,           # seconds, calls slower than this count as failure.
+    "reset_timeout": 30.0,      # seconds, how long circuit stays open before probing.
+    "half_open_probes": 1       # concurrent probe calls allowed while half-open.
+}
+
+
+class CircuitState(Enum):
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half_open"
+
+
+class CircuitOpenError(NotionUnavailableError):
+    """
+    Notion call is rejected without being sent, because circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around Notion calls.
+    Opens after consecutive failed or slow calls and rejects calls immediately while open,
+    then lets a few probe calls through after reset timeout, closing again when a probe succeeds.
+    """
+    def __init__(self, config: JSON | None = None, is_failure: Callable[[Exception], bool] = lambda e: True):
+        config = {**DEFAULT_BREAKER_CONFIG, **(config or {})}
+        self.failure_threshold: int = config["failure_threshold"]
+        self.slow_call: float = config["slow_call"]
+        self.reset_timeout: float = config["reset_timeout"]
+        self.half_open_probes: int = config["half_open_probes"]
+        self.is_failure: Callable[[Exception], bool] = is_failure
+        self.state: CircuitState = CircuitState.Closed
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self.probes: int = 0
+        self.stats: Counter[str] = Counter()
+        self.logger = logging.getLogger("d2wiki.notion")
+
+    def metrics(self) -> dict[str, float | str]:
+        """
+        Circuit breaker metrics.
+        :return: {metric name: value}
+        """
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "opened": self.stats["opened"],
+            "rejected": self.stats["rejected"],
+            "slow_calls": self.stats["slow_calls"]
+        }
+
+    def transition(self, state: CircuitState) -> None:
+        """
+        Move circuit to given state.
+        :param state: new state.
+        """
+        if state is self.state:
+            return
+        self.logger.warning(f"Notion circuit breaker : {self.state.value} -> {state.value}")
+        self.state = state
+        if state is CircuitState.Open:
+            self.opened_at = monotonic()
+            self.stats["opened"] += 1
+        if state is not CircuitState.Open:
+            self.failures = 0
+
+    def acquire(self) -> bool:
+        """
+        Acquire permission to call.
+        :return: True if the call is a half-open probe.
+        :raise CircuitOpenError: circuit is open.
+        """
+        if self.state is CircuitState.Open and monotonic() - self.opened_at >= self.reset_timeout:
+            self.transition(CircuitState.HalfOpen)
+        if self.state is CircuitState.Closed:
+            return False
+        if self.state is CircuitState.HalfOpen and self.probes < self.half_open_probes:
+            self.probes += 1
+            return True
+        self.stats["rejected"] += 1
+        raise CircuitOpenError("Notion circuit breaker is open.")
+
+    def record(self, failed: bool) -> None:
+        """
+        Record outcome of a call.
+        :param failed: whether call failed or was too slow.
+        """
+        if not failed:
+            if self.state is CircuitState.HalfOpen:
+                self.transition(CircuitState.Closed)
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state is CircuitState.HalfOpen or self.failures >= self.failure_threshold:
+            self.transition(CircuitState.Open)
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call Notion API through circuit breaker.
+        :param func: function making the call.
+        :return: result of the call.
+        :raise CircuitOpenError: circuit is open, so call is not made.
+        """
+        probe = self.acquire()
+        started = monotonic()
+        try:
+            res = await func()
+        except Exception as e:
+            self.record(self.is_failure(e))
+            raise
+        finally:
+            if probe:
+                self.probes -= 1
+        if slow := monotonic() - started > self.slow_call:
+            self.stats["slow_calls"] += 1
+        self.record(slow)
+        return res
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+
+from d2wiki.notion.search.bloom import normalize
+
+
+class NegativeCache:
+    """
+    Short-TTL LRU cache of (database, query) pairs which returned nothing.
+    Every entry has the same TTL, so entries are ordered by expiry, and expired ones are purged from the front on add.
+    """
+    def __init__(self, ttl: float = 60.0, maxsize: int = 4096):
+        self.ttl: float = ttl
+        self.maxsize: int = maxsize
+        self.entries: OrderedDict[tuple[str, str], float] = OrderedDict()     # (route, normalized query) -> expiry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, route: str, query: str) -> None:
+        now = monotonic()
+        key = (route, normalize(query))
+        self.entries[key] = now + self.ttl
+        self.entries.move_to_end(key)
+        while self.entries and (len(self.entries) > self.maxsize or next(iter(self.entries.values())) < now):
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        route, query = key
+        key = (route, normalize(query))
+        expiry = self.entries.get(key)
+        if expiry is None:
+            return False
+        if expiry < monotonic():
+            del self.entries[key]
+            return False
+        return True
+
+    def invalidate(self, route: str) -> None:
+        """
+        Drop every cached miss of database, since new rows may match them now.
+        :param route: database id.
+        """
+        for key in [k for k in self.entries.keys() if k[0] == route]:
+            del self.entries[key]
+
+
+class QueryCache:
+    """
+    LRU cache of (database, query) pairs to ids of the rows they returned.
+    Rows themselves live in the mirror, so cached results always resolve to the latest mirrored rows.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize: int = maxsize
+        self.entries: OrderedDict[tuple[str, str], tuple[str, ...]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, route: str, query: str) -> tuple[str, ...] | None:
+        key = (route, normalize(query))
+        ids = self.entries.get(key)
+        if ids is not None:
+            self.entries.move_to_end(key)
+        return ids
+
+    def put(self, route: str, query: str, ids: tuple[str, ...]) -> None:
+        key = (route, normalize(query))
+        self.entries[key] = ids
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
@@ -1,13 +1,42 @@
 from __future__ import annotations
-from typing import ClassVar, cast, Protocol
+import logging
+import time
+from datetime import datetime, timezone
+from collections import Counter
+from contextlib import aclosing
+from operator import attrgetter
+from typing import AsyncIterator, Awaitable, Callable, ClassVar, Container, Iterable, cast, Protocol, Any, Type, TypeVar, TYPE_CHECKING
 from uuid import UUID
 
-from notion_client import AsyncClient
+import httpx
+
 from notion_client.helpers import get_id
 
 from d2wiki.types import JSON
-from d2wiki.notion.models import D2ElementalWell, D2ExoticWeapon, D2ExoticArmor, flat_rich_text, D2Perk, NotionPage, \
-    NotionDatabase, NotionUser, NotionBlock
+from d2wiki.notion.models import D2ElementalWell, D2ExoticWeapon, D2ExoticArmor, D2Perk, D2JsonModel
+from .sessions import NotionSession, NotionSessionPool
+from .mirror import D2NotionMirror
+from .columnar import ColumnarTable, Column
+from .retry import RetryPolicy, is_rate_limited
+from .breaker import CircuitBreaker
+from .deadline import current_deadline, DeadlineExceededError
+from .errors import NotionUnavailableError
+from .identity import IdentityMap
+from .schema import RowDecoder, SchemaError, compile_decoder, property_ids
+from .streaming import STREAMING_AVAILABLE, iter_items
+
+if TYPE_CHECKING:
+    # Page & block models are only needed for page contents, so they are imported on use.
+    from d2wiki.notion.models import NotionPage, NotionDatabase, NotionUser, NotionBlock, NotionBlockType, RenderBudget
+    from .graph import BlockGraph
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE: dict[str, int] = {
+    "query": 10,        # name queries, of which reply shows the first result and lists the others.
+    "sync": 100         # mirror syncs. 100 is the maximum of Notion API.
+}
+USER_VERSION: str = ""      # identity map version of every user, as user object has no last_edited_time.
 
 
 class NotionObject(Protocol):
@@ -52,11 +81,166 @@ class D2NotionWrapper:
     This class only wraps json response to python model.
     """
     def __init__(self, config: JSON):
-        self.client: AsyncClient = AsyncClient(auth=config["token"])
+        self.retry: RetryPolicy = RetryPolicy(config.get("retry"))
+        tokens: str | list[str] = config["token"]     # single token, or list of tokens to spread calls over.
+        self.sessions: NotionSessionPool = NotionSessionPool(
+            [tokens] if isinstance(tokens, str) else tokens, config.get("http"), max_throttle=self.retry.max_delay
+        )
+        # rate limit is handled by rotating tokens, so only outages and slow calls trip the breaker.
+        self.breaker: CircuitBreaker = CircuitBreaker(
+            config.get("breaker"), is_failure=lambda e: not is_rate_limited(e) and self.retry.classify(e, 1) is not None
+        )
+        self.round_trip: float = config.get("deadline", {}).get("round_trip", 0.4)     # expected seconds of a Notion call.
+        self.identity: IdentityMap = IdentityMap()     # shared instances of retrieved entities and mirrored rows.
+        self.mirror: D2NotionMirror = D2NotionMirror(self)
+        self.mirror.tables.update({
+            D2NotionRoute.CombatStyleMods.ElementalWells: ColumnarTable([
+                Column("element", attrgetter("element")),
+                Column("mod_type", attrgetter("mod_type")),
+                Column("cost", attrgetter("cost"), categorical=False)
+            ]),
+            D2NotionRoute.Exotics.Armors: ColumnarTable([
+                Column("guardian_class", attrgetter("guardian_class")),
+                Column("category", attrgetter("category"))
+            ])
+        })
+        self.models: dict[str, Type[D2JsonModel]] = {
+            D2NotionRoute.Perks.PerkRow1: D2Perk,
+            D2NotionRoute.Perks.PerkRow2: D2Perk,
+            D2NotionRoute.Perks.PerkRow34: D2Perk,
+            D2NotionRoute.CombatStyleMods.ElementalWells: D2ElementalWell,
+            D2NotionRoute.Exotics.Weapons: D2ExoticWeapon,
+            D2NotionRoute.Exotics.Armors: D2ExoticArmor
+        }
+        self.schemas: dict[str, JSON] = {}              # route -> properties of database, retrieved once.
+        self.decoders: dict[str, RowDecoder] = {}       # route -> row decoder compiled from schema.
+        self.property_ids: dict[str, list[str]] = {}    # route -> ids of properties model needs, to filter responses.
+        self.schema_errors: dict[str, SchemaError] = {}  # route -> schema mismatch which disabled the database.
+        # rows per query page. name queries show a few results, while syncs list every row.
+        self.page_size: dict[str, int] = {**DEFAULT_PAGE_SIZE, **config.get("page_size", {})}
+        self.stats: Counter[str] = Counter()
+        # decode block pages incrementally as they arrive, if optional 'ijson' package is installed.
+        self.stream_blocks: bool = config.get("stream_blocks", False) and STREAMING_AVAILABLE
+        self.logger = logging.getLogger("d2wiki.notion")
+        self.synced_at: dict[str, str] = {}     # route -> latest last_edited_time synced.
+        # rows deleted in Notion are never returned by incremental syncs, so every database is fully listed again
+        # once in this many seconds, dropping rows it didn't list.
+        self.full_sync_interval: float = config.get("full_sync_interval", 3600.0)
+        self.full_synced_at: dict[str, float] = {}     # route -> monotonic time of the last full sync.
+
+    async def aclose(self) -> None:
+        """
+        Close http connection pools of notion clients.
+        """
+        await self.sessions.aclose()
+
+    def metrics(self) -> dict[str, dict[str, float | str]]:
+        """
+        Metrics of this wrapper, grouped by section.
+        :return: {section: {metric name: value}}
+        """
+        return {
+            **self.sessions.metrics(),
+            "query": {
+                "pages": self.stats["pages"],
+                "rows": self.stats["rows"],
+                "decode_ms_per_row": round(self.stats["decode_seconds"] * 1000 / self.stats["rows"], 3)
+                if self.stats["rows"] else 0.0
+            },
+            "retry": self.retry.metrics(),
+            "breaker": self.breaker.metrics(),
+            "identity": self.identity.metrics(),
+            "mirror": {
+                "rows": len(self.mirror),
+                "cached_queries": len(self.mirror.queries),
+                "cached_misses": len(self.mirror.misses)
+            }
+        }
+
+    async def request(self, endpoint: str, **kwargs: Any) -> JSON:
+        """
+        Call notion_client endpoint of the least-loaded token, through retry policy and circuit breaker.
+        :param endpoint: dotted endpoint method name of notion_client. (ex: "databases.query")
+        :param kwargs: arguments of the endpoint.
+        :return: json response.
+        :raise NotionUnavailableError: Notion API kept failing with transient errors, circuit breaker is open,
+                                       or interaction deadline is exceeded.
+        """
+        method = attrgetter(endpoint)
+        return await self.call(endpoint, lambda session: method(session.client)(**kwargs))
+
+    async def call(self, name: str, func: Callable[[NotionSession], Awaitable[T]]) -> T:
+        """
+        Make Notion call with the least-loaded token, through retry policy, circuit breaker and interaction deadline.
+        :param name: name of the call, for errors.
+        :param func: function making the call with given session.
+        :return: result of the call.
+        :raise NotionUnavailableError: Notion API kept failing with transient errors, circuit breaker is open,
+                                       or interaction deadline is exceeded.
+        """
+        async def attempt() -> T:
+            async with self.sessions.session() as session:
+                return await self.breaker.call(lambda: func(session))
+
+        deadline = current_deadline.get()
+        if deadline is None:
+            return await self.retry.call(attempt)
+        if not self.has_time():
+            raise DeadlineExceededError(f"No time left to call {name}.")
+        return await deadline.run(self.retry.call(attempt))
+
+    async def stream(self, path: str, query: JSON, prefix: str, meta: JSON) -> AsyncIterator[JSON]:
+        """
+        GET Notion API and decode response body incrementally, yielding each array element as soon as it arrives.
+        Only opening the response goes through retry policy and circuit breaker; errors while reading it propagate.
+        :param path: api path. (ex: blocks/{id}/children)
+        :param query: query parameters.
+        :param prefix: ijson prefix of array elements to yield. (ex: "results.item")
+        :param meta: dict to fill with top-level scalar values of response, complete once iteration finishes.
+        :return: async iterator of decoded elements.
+        """
+        async def open_response(session: NotionSession) -> tuple[NotionSession, httpx.Response]:
+            request = session.client._build_request("GET", path, query)
+            request.extensions["stream"] = True     # body is counted on close, instead of read by response hook.
+            response = await session.http.client.send(request, stream=True)
+            if response.is_error:
+                await response.aread()
+                await response.aclose()
+                session.client._parse_response(response)   # raises notion_client error of the response.
+            session.in_flight += 1      # body is still to be read after the call, so token stays loaded until close.
+            return session, response
+
+        session, response = await self.call(path, open_response)
+        try:
+            async with aclosing(iter_items(response.aiter_bytes(), prefix, meta)) as items:
+                async for item in items:
+                    yield item
+        finally:
+            session.in_flight -= 1
+            await response.aclose()
+            session.http.count_response(response)
+
+    def has_time(self, round_trips: int = 1) -> bool:
+        """
+        Check whether current interaction deadline leaves time for more Notion calls.
+        Model resolvers use this to return partial results instead of starting calls which cannot finish.
+        :param round_trips: number of sequential Notion calls to make.
+        :return: True if there is no deadline or enough time is left.
+        """
+        deadline = current_deadline.get()
+        return deadline is None or deadline.remaining() >= round_trips * self.round_trip
 
     @staticmethod
-    def get_icon_from_response(page: JSON) -> str | None:
-        return cast(dict[str, str], page["icon"]["file"])["url"] if page.get("icon") is not None else None
+    async def resolve(model: D2JsonModel) -> D2JsonModel:
+        """
+        Resolve model, falling back to partially resolved model if interaction deadline is exceeded meanwhile.
+        :param model: parsed model.
+        :return: resolved or partial model.
+        """
+        try:
+            return await model.resolve()
+        except DeadlineExceededError:
+            return model
 
     get_id = staticmethod(get_id)       # wrap helper function 'get_id' into D2NotionWrapper
 
@@ -64,163 +248,287 @@ class D2NotionWrapper:
     def get_shared_url(_id: str):
         return f"https://destinyko.notion.site/{_id.replace('-', '')}"
 
-    async def query_perks(self, route: str, perk_name: str) -> list[D2Perk]:
-        resp = await self.client.databases.query(**{
-            "database_id": route,
-            "filter": {
-                "property": "이름",
-                "rich_text": {
-                    "contains": perk_name
-                }
-            }
-        })
-
-        from pprint import pprint
-        pprint(resp)
-
+    async def decoder(self, route: str) -> RowDecoder:
+        """
+        Return row decoder of database, retrieving its schema and compiling decoder on first use.
+        :param route: database id.
+        A database whose schema doesn't match its model is disabled until next sync retries it, and other databases
+        are not affected.
+        :return: function decoding page object of a row into model.
+        :raise SchemaError: database schema doesn't match the model.
+        """
+        if route in self.schema_errors:
+            raise self.schema_errors[route]
+        decode = self.decoders.get(route)
+        if decode is None:
+            database = await self.retrieve_database(route)
+            if database is None:
+                raise SchemaError(f"Failed to retrieve schema of database {route}.")
+            self.schemas[route] = database.properties
+            try:
+                decode = compile_decoder(self, route, self.models[route], database.properties, self.logger)
+            except SchemaError as e:
+                self.logger.error(f"Disabled database {route} : {e}")
+                self.schema_errors[route] = e
+                raise
+            self.decoders[route] = decode
+            self.property_ids[route] = property_ids(self.models[route], database.properties)
+        return decode
+
+    async def query_database(self, route: str, **body: Any) -> JSON:
+        """
+        Query database, requesting only properties the model of database needs.
+        notion_client doesn't pass `filter_properties` query parameter yet, so the request is built here.
+        :param route: database id. Its decoder must be compiled first, see `decoder()`.
+        :param body: request body. (filter, sorts, start_cursor, page_size)
+        :return: json response of a query page.
+        """
+        resp = await self.request(
+            "request",
+            path=f"databases/{route}/query",
+            method="POST",
+            query={"filter_properties": self.property_ids[route]},
+            body=body
+        )
+        self.stats["pages"] += 1
+        return resp
+
+    async def load_row(self, route: str, decode: RowDecoder, page: JSON) -> D2JsonModel | None:
+        """
+        Decode and resolve a row. Bad rows are logged and skipped, instead of failing the whole result.
+        :param route: database id.
+        :param decode: row decoder of the database.
+        :param page: page object of the row.
+        :return: resolved (or partial, if interaction deadline is exceeded) model, or None if row is bad.
+        :raise NotionUnavailableError: Notion API failed while resolving.
+        """
         try:
-            return [D2Perk.from_json(
-                nc=self,
-                _id=page["id"],
-                name=page["properties"]["이름"]["title"],
-                description=page["properties"]["설명"]["rich_text"],
-                page_url=page["url"],
-                img_url=self.get_icon_from_response(page)
-            ) for page in resp["results"]]
+            started = time.perf_counter()
+            model = decode(page)
+            self.stats["decode_seconds"] += time.perf_counter() - started
+            self.stats["rows"] += 1
+            return await self.resolve(model)
+        except NotionUnavailableError:
+            raise
         except Exception as e:
-            print("Error occurred while querying weapon perk!")
-            pprint(e)
+            self.logger.warning(f"Skipped bad row {page.get('id')} of database {route} : {e!r}")
+            return None
+
+    async def iter_rows(self, route: str, filter: JSON | None = None, page_size: int | None = None) -> AsyncIterator[JSON]:
+        """
+        Iterate raw rows of database, following `next_cursor` lazily as each page is consumed.
+        :param route: database id to query.
+        :param filter: Notion database filter, or None to list every row.
+        :param page_size: rows per query page. Defaults to sync page size.
+        :return: async iterator of page objects.
+        """
+        await self.decoder(route)   # property ids to request are known once decoder is compiled.
+        body: JSON = {"page_size": page_size or self.page_size["sync"]}
+        if filter is not None:
+            body["filter"] = filter
+        while True:
+            resp = await self.query_database(route, **body)
+            for page in resp["results"]:
+                yield page
+            if not resp["has_more"]:
+                return
+            body["start_cursor"] = resp["next_cursor"]
+
+    async def iter_database(self, route: str, filter: JSON | None = None,
+                            page_size: int | None = None) -> AsyncIterator[D2JsonModel]:
+        """
+        Iterate rows of database as models, yielding each as its page arrives, and upsert them into local mirror.
+        Rows which are mirrored with the same version are not parsed again. Bad rows are skipped.
+        Consumers may stop early, and remaining pages are never requested.
+        Usage :
+            async with aclosing(nc.iter_database(route)) as rows:
+                async for model in rows:
+                    ...
+        :param route: database id to query.
+        :param filter: Notion database filter, or None to list every row.
+        :param page_size: rows per query page. Defaults to sync page size.
+        :return: async iterator of models.
+        """
+        decode = await self.decoder(route)
+        async with aclosing(self.iter_rows(route, filter, page_size)) as pages:
+            async for page in pages:
+                if self.mirror.is_fresh(page["id"], page["last_edited_time"]):
+                    yield self.mirror.get(page["id"])
+                    continue
+                model = await self.load_row(route, decode, page)
+                if model is None:
+                    continue
+                # partial model is mirrored without version, so it is resolved again on next query or sync.
+                self.mirror.upsert(route, model, page["last_edited_time"] if model.complete else "")
+                yield model
+
+    async def query_by_name(self, route: str, query: str, limit: int | None = None) -> list[D2JsonModel]:
+        """
+        Query database rows whose name contains query, and upsert them into local mirror.
+        Guaranteed misses are answered locally from the mirror's known-name filter and negative cache.
+        :param route: database id to query.
+        :param query: name to search.
+        :param limit: maximum number of rows. Defaults to query page size, so a query takes one round trip.
+        :return: list of models parsed from rows.
+        """
+        if self.mirror.is_known_miss(route, query):
             return []
 
-    async def query_elemental_well(self, query: str) -> list[D2ElementalWell]:
-        resp = await self.client.databases.query(**{
-            "database_id": D2NotionRoute.CombatStyleMods.ElementalWells,
-            "filter": {
-                "property": "이름",
-                "rich_text": {
-                    "contains": query
-                }
-            }
-        })
+        limit = limit or self.page_size["query"]
+        res: list[D2JsonModel] = []
+        name_filter: JSON = {"property": "이름", "rich_text": {"contains": query}}
+        async with aclosing(self.iter_database(route, name_filter, page_size=limit)) as rows:
+            async for model in rows:
+                res.append(model)
+                if len(res) >= limit:
+                    break
+
+        if res:
+            self.mirror.queries.put(route, query, tuple(getattr(m, "id") for m in res))
+        else:
+            self.mirror.misses.add(route, query)
+        return res
 
-        from pprint import pprint
-        pprint(resp)
+    async def query_perks(self, route: str, perk_name: str) -> list[D2Perk]:
+        return cast(list[D2Perk], await self.query_by_name(route, perk_name))
 
-        try:
-            return [D2ElementalWell.from_json(
-                nc=self,
-                _id=page["id"],
-                name=flat_rich_text(page["properties"]["이름"]["title"]),
-                element=page["properties"]["원소"]["select"]["name"],
-                mod_type=page["properties"]["분류"]["select"]["name"],
-                cost=page["properties"]["에너지"]["number"],
-                description=flat_rich_text(page["properties"]["설명"]["rich_text"]),
-                footer=flat_rich_text(page["properties"]["각주"]["rich_text"]),
-                page_url=page["url"],
-                img_url=self.get_icon_from_response(page)
-            ) for page in resp["results"]]
-        except Exception as e:
-            print("Error occurred while querying elemental well!")
-            pprint(e)
-            return []
+    async def query_elemental_well(self, query: str) -> list[D2ElementalWell]:
+        return cast(list[D2ElementalWell], await self.query_by_name(D2NotionRoute.CombatStyleMods.ElementalWells, query))
 
     async def query_exotic_weapon(self, query: str) -> list[D2ExoticWeapon]:
-        resp = await self.client.databases.query(**{
-            "database_id": D2NotionRoute.Exotics.Weapons,
-            "filter": {
-                "property": "이름",
-                "rich_text": {
-                    "contains": query
-                }
-            }
-        })
-
-        from pprint import pprint
-        pprint(resp)
-
-        try:
-            return [D2ExoticWeapon.from_json(
-                nc=self,
-                _id=page["id"],
-                name=flat_rich_text(page["properties"]["이름"]["title"]),
-                exotic_perk=flat_rich_text(page["properties"]["경이 특성"]["rich_text"]),
-                description=flat_rich_text(page["properties"]["설명"]["rich_text"]),
-                img_url=self.get_icon_from_response(page)
-            ) for page in resp["results"]]
-        except Exception as e:
-            print("Error occurred while querying exotic weapon!")
-            pprint(e)
-            return []
+        return cast(list[D2ExoticWeapon], await self.query_by_name(D2NotionRoute.Exotics.Weapons, query))
 
     async def query_exotic_armor(self, query: str) -> list[D2ExoticArmor]:
-        resp = await self.client.databases.query(**{
-            "database_id": D2NotionRoute.Exotics.Armors,
-            "filter": {
-                "property": "이름",
-                "rich_text": {
-                    "contains": query
-                }
-            }
-        })
+        return cast(list[D2ExoticArmor], await self.query_by_name(D2NotionRoute.Exotics.Armors, query))
 
-        from pprint import pprint
-        pprint(resp)
+    async def sync_database(self, route: str) -> int:
+        """
+        Sync database rows into local mirror.
+        Full sync lists every row and drops deleted rows from mirror. It runs first, and then once in
+        `full_sync_interval` seconds. Syncs in between only fetch rows edited since the last sync,
+        dropping rows which are archived or moved to trash meanwhile.
+        :param route: database id to sync.
+        :return: number of rows inserted, changed or removed.
+        """
+        self.schema_errors.pop(route, None)     # schema may be fixed since, so compile decoder again.
+        decode = await self.decoder(route)
+        full: bool = (
+            route not in self.mirror.synced or route not in self.synced_at
+            or time.monotonic() - self.full_synced_at.get(route, float("-inf")) >= self.full_sync_interval
+        )
+        # rows edited while listing are caught by next sync, as it starts from here if database has no rows.
+        started: str = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        edited_since: JSON | None = None
+        if not full:
+            edited_since = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.synced_at[route]}}
+
+        seen: set[str] = set()
+        changed: int = 0
+        latest: str = self.synced_at.get(route, "")
+        async for page in self.iter_rows(route, edited_since):
+            latest = max(latest, page["last_edited_time"])
+            if page.get("archived") or page.get("in_trash"):
+                changed += page["id"] in self.mirror.routes
+                self.mirror.remove(page["id"])
+                continue
+            seen.add(page["id"])
+            if self.mirror.is_fresh(page["id"], page["last_edited_time"]):
+                continue
+            model = await self.load_row(route, decode, page)
+            if model is None:
+                continue
+            changed += self.mirror.upsert(route, model, page["last_edited_time"])
+
+        if full:
+            for _id in set(self.mirror.rows.get(route, {}).keys()) - seen:
+                self.mirror.remove(_id)
+                changed += 1
+            self.mirror.mark_synced(route)
+            self.full_synced_at[route] = time.monotonic()
+        if latest:
+            self.synced_at[route] = latest
+        elif full:
+            self.synced_at[route] = started
+        return changed
+
+    async def sync(self) -> int:
+        """
+        Sync every known database into local mirror.
+        :return: number of rows inserted, changed or removed.
+        """
+        changed: int = 0
+        for route in self.models.keys():
+            try:
+                changed += await self.sync_database(route)
+            except SchemaError:
+                continue    # logged and disabled by decoder, other databases are synced as usual.
+            except NotionUnavailableError:
+                raise       # other databases would fail the same way.
+            except Exception as e:
+                self.logger.error(f"Failed to sync database {route} : {e!r}")
+        return changed
+
+    def filter(self, route: str, **conditions: Any) -> list[D2JsonModel]:
+        """
+        Filter mirrored rows by structured fields. This never calls Notion API.
+        Usage :
+            nc.filter(D2NotionRoute.CombatStyleMods.ElementalWells, element=D2Element.SOLAR, cost=("<=", 2))
+        :param route: database id to filter.
+        :param conditions: column name -> condition. See `ColumnarTable.filter()`.
+        :return: list of matching models.
+        """
+        return self.mirror.filter(route, **conditions)
 
-        try:
-            res = [D2ExoticArmor.from_json(
-                nc=self,
-                _id=page["id"],
-                name=page["properties"]["이름"]["title"],
-                guardian_class=page["properties"]["직업"]["select"]["name"],
-                category=page["properties"]["부위"]["select"]["name"],
-                exotic_perk_name=page["properties"]["경이 특성"]["rich_text"],
-                page_url=page["url"],
-                img_url=self.get_icon_from_response(page)
-            ) for page in resp["results"]]
-            for elem in res:
-                await elem.resolve_description()
-            return res
-        except Exception as e:
-            print("Error occurred while querying exotic armor!")
-            import traceback
-            pprint(e)
-            traceback.print_tb(e.__traceback__)
-            return []
+    def search(self, query: str, limit: int = 10) -> list[D2JsonModel]:
+        """
+        Full-text search over mirrored rows. This never calls Notion API.
+        :param query: query text.
+        :param limit: maximum number of results.
+        :return: list of models ordered by relevance.
+        """
+        return self.mirror.search(query, limit)
 
-    async def retrieve_database(self, database_id: str) -> NotionDatabase | None:
+    async def retrieve_database(self, database_id: str, version: str | None = None) -> NotionDatabase | None:
         """
-        Retrieve Notion Page and wrap it as NotionPage model.
+        Retrieve Notion Database and wrap it as NotionDatabase model.
+        Database of known version which is still in identity map is returned without calling Notion API.
+        Otherwise retrieved database replaces the shared instance if it is newer.
         :param database_id: database id (UUID as str)
-        :return: list of NotionDatabase element queried.
+        :param version: last_edited_time of the database, if caller knows it.
+        :return: NotionDatabase object.
         """
-        resp = await self.client.databases.retrieve(page_id=database_id)
-
-        from pprint import pprint
-        # pprint(resp)
+        from d2wiki.notion.models import NotionDatabase
+        if version is not None and (database := self.identity.get(NotionDatabase, database_id, version)) is not None:
+            return database
+        resp = await self.request("databases.retrieve", database_id=database_id)
 
         try:
-            return NotionDatabase.from_json(
+            return self.identity.resolve(NotionDatabase, resp["id"], resp["last_edited_time"], lambda: NotionDatabase.from_json(
                 nc=self,
-                id=resp["id"]
-            )
+                id=resp["id"],
+                properties=resp["properties"]
+            ))
         except Exception as e:
-            print("Error occurred while retrieving notion page!")
-            pprint(e)
+            self.logger.warning(f"Error occurred while retrieving notion database {database_id} : {e!r}")
             return None
 
-    async def retrieve_page(self, page_id: str) -> NotionPage | None:
+    async def retrieve_page(self, page_id: str, version: str | None = None) -> NotionPage | None:
         """
         Retrieve Notion Page and wrap it as NotionPage model.
+        Page of known version which is still in identity map is returned without calling Notion API.
+        Otherwise retrieved page replaces the shared instance if it is newer.
         :param page_id: page id (UUID as str)
-        :return: list of NotionPage element queried.
+        :param version: last_edited_time of the page, if caller knows it. Version of mirrored row is used if None.
+        :return: NotionPage object.
         """
-        resp = await self.client.pages.retrieve(page_id=page_id)
-
-        from pprint import pprint
-        # pprint(resp)
+        from d2wiki.notion.models import NotionPage
+        version = self.mirror.versions.get(page_id) if version is None else version     # database row is the same page.
+        if version is not None and (page := self.identity.get(NotionPage, page_id, version)) is not None:
+            return page
+        resp = await self.request("pages.retrieve", page_id=page_id)
 
         try:
-            return NotionPage.from_json(
+            return self.identity.resolve(NotionPage, resp["id"], resp["last_edited_time"], lambda: NotionPage.from_json(
                 nc=self,
                 id=resp["id"],
                 created_time=resp["created_time"],
@@ -233,26 +541,31 @@ class D2NotionWrapper:
                 parent=resp["parent"],
                 properties=resp["properties"],
                 url=resp["url"]
-            )
+            ))
         except Exception as e:
-            print("Error occurred while retrieving notion page!")
-            pprint(e)
+            self.logger.warning(f"Error occurred while retrieving notion page {page_id} : {e!r}")
             return None
 
     async def retrieve_user(self, user_id: str) -> NotionUser | None:
-        resp = await self.client.users.retrieve(user_id=user_id)
-
-        from pprint import pprint
-        pprint(resp)
+        """
+        Retrieve Notion User and wrap it as NotionUser model.
+        User which is still in identity map is returned without calling Notion API.
+        :param user_id: user id (UUID as str)
+        :return: NotionUser object.
+        """
+        from d2wiki.notion.models import NotionUser
+        # user object has no last_edited_time, and the model only holds its id, so every user is the same version.
+        if (user := self.identity.get(NotionUser, user_id, USER_VERSION)) is not None:
+            return user
+        resp = await self.request("users.retrieve", user_id=user_id)
 
         try:
-            return NotionUser.from_json(
+            return self.identity.resolve(NotionUser, resp["id"], USER_VERSION, lambda: NotionUser.from_json(
                 nc=self,
-
-            )
+                id=resp["id"]
+            ))
         except Exception as e:
-            print("Error occurred while retrieving notion user!")
-            pprint(e)
+            self.logger.warning(f"Error occurred while retrieving notion user {user_id} : {e!r}")
             return None
 
     async def retrieve_child_blocks(self, parent: HasChildren) -> None:
@@ -262,25 +575,90 @@ class D2NotionWrapper:
         Reference : https://developers.notion.com/docs/working-with-page-content
         :param parent: Notion Model object matched with HasChildren protocol. Content blocks will be appended inside this object.
         """
-        block_id = parent.id
-        finished: bool = False
-        next_cursor: str = ""
-        blocks: list[NotionBlock] = []
+        from .graph import BlockGraph
+        graph = BlockGraph(self, follow_links=False)
+        parent.children = (await graph.crawl([parent]))[parent.id]
 
-        from pprint import pprint
-        while not finished:
-            if next_cursor:
-                resp = await self.client.blocks.children.list(block_id=block_id, page_size=100, start_cursor=next_cursor)
-            else:
-                resp = await self.client.blocks.children.list(block_id=block_id, page_size=100)
-            # print("Retrieving child blocks...")
-            # pprint(resp)
-            for block_resp in resp["results"]:
-                blocks.append(await NotionBlock.from_json(nc=parent.nc, _parent=parent, **block_resp).retrieve_children())
-
-            if resp["has_more"]:
-                next_cursor = resp["next_cursor"]
-            else:
-                finished = True
+    async def crawl(self, page_ids: Iterable[str], follow_links: bool = True) -> BlockGraph:
+        """
+        Fetch block trees of a batch of pages, resolving synced blocks, child pages and links to pages.
+        Each tree is fetched once however many pages refer to it, so cost is proportional to unique content.
+        :param page_ids: ids of pages to crawl.
+        :param follow_links: crawl pages linked by link_to_page blocks too.
+        :return: crawled block graph. `graph.trees[page_id]` is child blocks of the page.
+        """
+        from .graph import BlockGraph
+        graph = BlockGraph(self, follow_links=follow_links)
+        await graph.crawl(page_ids)
+        return graph
+
+    async def render_blocks(self, parent: HasChildren | str, budget: RenderBudget,
+                            render: Callable[[NotionBlock], str], separator: str = "\n") -> str:
+        """
+        Render child blocks within budget, fetching them on demand.
+        Only blocks of budget types are parsed and rendered, and children of a block are fetched only if it is rendered
+        within budget depth. Once next block doesn't fit in budget characters, remaining pages and subtrees are not fetched.
+        :param parent: parent block or page, or its id. See `iter_children()`.
+        :param budget: render budget of block types, depth and characters.
+        :param render: function rendering a block into text.
+        :param separator: text joining rendered blocks.
+        :return: rendered text, in document order.
+        """
+        parts: list[str] = []
+        used: int = 0
+
+        async def walk(parent: HasChildren | str, depth: int) -> bool:
+            nonlocal used
+            async with aclosing(self.iter_children(parent, budget.types)) as blocks:
+                async for block in blocks:
+                    text = render(block)
+                    cost = len(text) + (len(separator) if parts else 0)
+                    if used + cost > budget.chars:
+                        return False
+                    parts.append(text)
+                    used += cost
+                    if depth < budget.depth and block.has_children and not await walk(block, depth + 1):
+                        return False
+            return True
+
+        await walk(parent, 0)
+        return separator.join(parts)
+
+    async def iter_children(self, parent: HasChildren | str,
+                            types: Container[NotionBlockType] | None = None) -> AsyncIterator[NotionBlock]:
+        """
+        Iterate child blocks of block or page, following `next_cursor` lazily as each page is consumed.
+        Children of yielded blocks are not retrieved, so consumers decide how deep to go.
+        :param parent: Notion Model object matched with HasChildren protocol, which becomes `parent_ref` of yielded blocks,
+                       or id of block or page, whose object is retrieved only if `full_parent()` is called.
+        :param types: block types to yield. Other blocks are skipped before being parsed. Every type if None.
+        :return: async iterator of child blocks.
+        """
+        from d2wiki.notion.models import NotionBlock, NotionBlockType
+        block_id, full_parent = (parent, None) if isinstance(parent, str) else (parent.id, parent)
+        type_names = None if types is None else {t.value for t in NotionBlockType if t in types}
+
+        def parse(block_resp: JSON) -> NotionBlock | None:
+            if type_names is not None and block_resp["type"] not in type_names:
+                return None
+            return self.identity.resolve(
+                NotionBlock, block_resp["id"], block_resp["last_edited_time"],
+                lambda: NotionBlock.from_json(nc=self, _parent=full_parent, **block_resp)
+            )
 
-        parent.children = blocks
+        query: JSON = {"page_size": self.page_size["sync"]}
+        while True:
+            if self.stream_blocks:
+                resp: JSON = {}
+                async with aclosing(self.stream(f"blocks/{block_id}/children", query, "results.item", resp)) as items:
+                    async for block_resp in items:
+                        if (block := parse(block_resp)) is not None:
+                            yield block
+            else:
+                resp = await self.request("blocks.children.list", block_id=block_id, **query)
+                for block_resp in resp["results"]:
+                    if (block := parse(block_resp)) is not None:
+                        yield block
+            if not resp["has_more"]:
+                return
+            query["start_cursor"] = resp["next_cursor"]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import operator
+from array import array
+from enum import Enum
+from importlib.util import find_spec
+from typing import Any, Callable, Iterable
+
+from d2wiki.notion.models import D2JsonModel
+from d2wiki.utils.importtime import lazy_import
+
+NUMPY_AVAILABLE: bool = find_spec("numpy") is not None    # predicates are vectorized with numpy if installed.
+if NUMPY_AVAILABLE:
+    numpy = lazy_import("numpy")    # loaded by the first filter, so mirror doesn't pay for it on startup.
+
+COMPARATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+
+class StringPool:
+    """
+    Interned string pool, mapping each distinct string to a small integer code.
+    """
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, s: str) -> int:
+        """
+        :return: code of the string, assigning a new code on first use.
+        """
+        code = self.codes.get(s)
+        if code is None:
+            code = self.codes[s] = len(self.strings)
+            self.strings.append(s)
+        return code
+
+
+class Column:
+    """
+    Column of a ColumnarTable. Categorical values (enums and strings) are stored as codes of a string pool,
+    and numbers are stored as they are. Missing values are stored as `null` sentinel, which matches no condition.
+    """
+    def __init__(self, name: str, extract: Callable[[D2JsonModel], Any], categorical: bool = True):
+        self.name: str = name
+        self.extract: Callable[[D2JsonModel], Any] = extract
+        self.pool: StringPool | None = StringPool() if categorical else None
+        self.values: array = array("H" if categorical else "i")
+        self.null: int = 2 ** 16 - 1 if categorical else -2 ** 31     # largest code, or smallest number.
+
+    def encode(self, value: Any) -> int:
+        if value is None:
+            return self.null
+        if self.pool is None:
+            return int(value)
+        return self.pool.intern(value.value if isinstance(value, Enum) else str(value))
+
+    def code_of(self, value: Any) -> int | None:
+        """
+        :return: code of the value, or None if no row has it.
+        """
+        if value is None:
+            return None
+        if self.pool is None:
+            return value
+        return self.pool.codes.get(value.value if isinstance(value, Enum) else str(value))
+
+    def mask(self, condition: Any) -> Any:
+        """
+        Evaluate condition on every row. Rows missing the value never match, whatever the operator is.
+        :param condition: value to compare equal, set or list of values to match any of,
+                          or (operator, value) tuple such as ("<=", 2).
+        :return: boolean numpy array if numpy is available, otherwise list of bool.
+        """
+        if isinstance(condition, tuple):
+            op, value = COMPARATORS[condition[0]], condition[1]
+            codes = [self.code_of(value)]
+        elif isinstance(condition, (set, frozenset, list)):
+            op, codes = None, [self.code_of(v) for v in condition]
+        else:
+            op, codes = operator.eq, [self.code_of(condition)]
+        codes = [c for c in codes if c is not None]
+
+        if NUMPY_AVAILABLE:
+            values = numpy.frombuffer(self.values, dtype=self.values.typecode) if len(self.values) else numpy.empty(0)
+            if op is None:
+                return numpy.isin(values, codes)
+            return (op(values, codes[0]) if codes else numpy.full(len(values), op is operator.ne)) & (values != self.null)
+        if op is None:
+            codes = set(codes)
+            return [v in codes for v in self.values]
+        if not codes:
+            return [op is operator.ne and v != self.null for v in self.values]
+        return [op(v, codes[0]) and v != self.null for v in self.values]
+
+
+class ColumnarTable:
+    """
+    Columnar in-memory table of a database, answering structured filters over its rows.
+    Rows are upserted and removed along with the mirror. Removed rows leave a hole, which is reused by next insert.
+    """
+    def __init__(self, columns: Iterable[Column]):
+        self.columns: dict[str, Column] = {c.name: c for c in columns}
+        self.ids: list[str | None] = []         # row -> id, None if row is removed.
+        self.rows: dict[str, int] = {}          # id -> row
+        self.free: list[int] = []               # removed rows to reuse.
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def upsert(self, _id: str, model: D2JsonModel) -> None:
+        """
+        Insert or replace row of the model.
+        :param _id: notion id of the row.
+        :param model: D2 model of the row.
+        """
+        row = self.rows.get(_id)
+        if row is None:
+            row = self.rows[_id] = self.free.pop() if self.free else len(self.ids)
+            if row == len(self.ids):
+                self.ids.append(_id)
+                for column in self.columns.values():
+                    column.values.append(column.null)
+            else:
+                self.ids[row] = _id
+        for column in self.columns.values():
+            column.values[row] = column.encode(column.extract(model))
+
+    def remove(self, _id: str) -> None:
+        """
+        Remove row. Does nothing if row is not in table.
+        :param _id: notion id of the row.
+        """
+        row = self.rows.pop(_id, None)
+        if row is not None:
+            self.ids[row] = None
+            self.free.append(row)
+
+    def filter(self, **conditions: Any) -> list[str]:
+        """
+        Find rows matching every condition.
+        Usage :
+            table.filter(element=D2Element.SOLAR, cost=("<=", 2))
+        :param conditions: column name -> condition. See `Column.mask()` for the form of conditions.
+        :return: ids of matching rows, in insertion order.
+        """
+        mask = None
+        for name, condition in conditions.items():
+            if condition is None:
+                continue
+            m = self.columns[name].mask(condition)
+            mask = m if mask is None else (mask & m if NUMPY_AVAILABLE else [a and b for a, b in zip(mask, m)])
+        if mask is None:
+            return [_id for _id in self.ids if _id is not None]
+        rows = numpy.flatnonzero(mask).tolist() if NUMPY_AVAILABLE else [i for i, hit in enumerate(mask) if hit]
+        return [_id for _id in map(self.ids.__getitem__, rows) if _id is not None]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Awaitable, Iterator, TypeVar
+
+from .errors import NotionUnavailableError
+
+T = TypeVar("T")
+
+# Discord interactions must be answered in 3 seconds, or in 15 minutes once deferred.
+RESPONSE_TIMEOUT: float = 3.0
+DEFERRED_TIMEOUT: float = 15 * 60.0
+
+
+class DeadlineExceededError(NotionUnavailableError):
+    """
+    Notion call is cancelled or not made, because interaction can no longer be answered in time.
+    """
+
+
+class Deadline:
+    """
+    Point in time by which an interaction must be answered.
+    Shared by every Notion call made for the interaction, and can be extended when interaction is deferred.
+    """
+    def __init__(self, seconds: float):
+        self.expires_at: float = monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        :return: seconds left until deadline, which is negative if deadline is passed.
+        """
+        return self.expires_at - monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def extend(self, seconds: float) -> None:
+        """
+        Move deadline to given seconds from now. Deadline is never shortened.
+        :param seconds: seconds from now.
+        """
+        self.expires_at = max(self.expires_at, monotonic() + seconds)
+
+    async def run(self, aw: Awaitable[T]) -> T:
+        """
+        Await within this deadline, cancelling it once deadline is passed.
+        :param aw: awaitable to run.
+        :return: result of the awaitable.
+        :raise DeadlineExceededError: deadline is passed before awaitable is done.
+        """
+        task = asyncio.ensure_future(aw)
+        try:
+            while True:
+                # deadline may be extended while waiting, so re-check it on every timeout.
+                done, _ = await asyncio.wait({task}, timeout=max(self.remaining(), 0))
+                if done:
+                    return task.result()
+                if self.expired:
+                    raise DeadlineExceededError("Interaction deadline is exceeded.")
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """
+    Bound Notion calls made inside this context, including tasks created inside it, by a deadline.
+    :param seconds: seconds from now.
+    """
+    d = Deadline(seconds)
+    token = current_deadline.set(d)
+    try:
+        yield d
+    finally:
+        current_deadline.reset(token)
@@ -0,0 +1,5 @@
+class NotionUnavailableError(Exception):
+    """
+    Notion API failed with transient errors, and retries are exhausted.
+    Distinguishes "Notion is not answering" from "nothing matched".
+    """
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Iterable, TYPE_CHECKING
+
+from notion_client import APIResponseError, APIErrorCode
+
+from d2wiki.notion.models import NotionBlock, NotionBlockType
+from d2wiki.notion.models.notion_block import NotionLinkToPage
+
+if TYPE_CHECKING:
+    from .client import D2NotionWrapper, HasChildren
+
+
+class BlockGraph:
+    """
+    Block graph of a batch of pages.
+    Synced blocks, child pages and links to pages are resolved into the trees they refer to,
+    and each tree is fetched exactly once across the batch, however many pages refer to it.
+    Subtrees are shared : every reference to a tree gets the same list of child blocks.
+    """
+    def __init__(self, nc: D2NotionWrapper, follow_links: bool = True, concurrency: int = 4):
+        self.nc: D2NotionWrapper = nc
+        self.follow_links: bool = follow_links      # crawl pages linked by link_to_page blocks too.
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self.trees: dict[str, list[NotionBlock]] = {}   # id of page or block -> its child blocks.
+        self.owners: dict[str, HasChildren] = {}        # id of tree -> page or block object it belongs to, if known.
+        self.stats: Counter[str] = Counter()
+        self.logger = logging.getLogger("d2wiki.notion")
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Crawl metrics.
+        :return: {metric name: value}
+        """
+        return {
+            "trees": len(self.trees),
+            "fetched": self.stats["fetched"],
+            "references": self.stats["references"],
+            "cycles": self.stats["cycles"]
+        }
+
+    @staticmethod
+    def content_of(block: NotionBlock) -> str | None:
+        """
+        :return: id of the tree which is the content of block, or None if block has no content.
+        """
+        match block.type:
+            case NotionBlockType.SYNCED_BLOCK:
+                # duplicate synced block lists the same children as its original, so only the original is fetched.
+                return block.data.synced_from or (block.id if block.has_children else None)
+            case NotionBlockType.CHILD_PAGE:
+                return block.id     # child page shares its id with the block.
+            case _:
+                return block.id if block.has_children else None
+
+    def references(self, block: NotionBlock) -> Iterable[str]:
+        """
+        :return: ids of trees block refers to, which need to be fetched.
+        """
+        if (content := self.content_of(block)) is not None:
+            yield content
+        if self.follow_links and block.type == NotionBlockType.LINK_TO_PAGE:
+            if isinstance(block.data, NotionLinkToPage):
+                yield block.data.target
+            else:
+                self.logger.warning(f"Skipped link of block {block.id} to unsupported type {block.data.json.get('type')}")
+
+    async def fetch(self, _id: str) -> list[NotionBlock]:
+        async with self.semaphore:
+            self.stats["fetched"] += 1
+            try:
+                return [block async for block in self.nc.iter_children(_id)]
+            except APIResponseError as e:
+                if e.code not in (APIErrorCode.ObjectNotFound, APIErrorCode.ValidationError):
+                    raise
+                # linked page which is not shared with integration, or database linked as page.
+                self.logger.warning(f"Skipped block tree {_id} : {e!r}")
+                return []
+
+    async def crawl(self, roots: Iterable[HasChildren | str]) -> dict[str, list[NotionBlock]]:
+        """
+        Fetch block trees of pages, following references breadth-first. Trees fetched by previous crawls are reused.
+        Each fetched block gets the page or block object it is a child of as `parent_ref`, if the object is known.
+        :param roots: pages or blocks to crawl, or their ids.
+        :return: {root id: child blocks of root, with every reference resolved}
+        """
+        ids: list[str] = []
+        for root in roots:
+            if not isinstance(root, str):
+                self.owners[root.id] = root
+            ids.append(root if isinstance(root, str) else root.id)
+        roots = list(dict.fromkeys(ids))
+        frontier: list[str] = roots
+        while frontier:
+            batch = [_id for _id in dict.fromkeys(frontier) if _id not in self.trees]
+            frontier = []
+            for _id, blocks in zip(batch, await asyncio.gather(*map(self.fetch, batch))):
+                self.trees[_id] = blocks
+                for block in blocks:
+                    self.owners.setdefault(block.id, block)
+                    refs = list(self.references(block))
+                    self.stats["references"] += len(refs)
+                    frontier.extend(refs)
+        self.link(roots)
+        self.set_parents()
+        return {_id: self.trees[_id] for _id in roots}
+
+    def set_parents(self) -> None:
+        """
+        Set `parent_ref` of blocks whose parent is known. A synced original found after its duplicates is used, too.
+        """
+        for _id, blocks in self.trees.items():
+            if (owner := self.owners.get(_id)) is None:
+                continue
+            for block in blocks:
+                if block.parent_ref is None:
+                    block.set_parent(owner)
+
+    def link(self, roots: Iterable[str]) -> None:
+        """
+        Set children of each block to the shared tree of its content.
+        A reference back to a tree which contains it is left unexpanded, so linked trees never form a cycle.
+        Links to pages are not expanded, and their trees are looked up from `trees` instead.
+        :param roots: ids of trees to link from.
+        """
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(_id: str) -> None:
+            visiting.add(_id)
+            for block in self.trees[_id]:
+                content = self.content_of(block)
+                if content is None or content not in self.trees:
+                    continue
+                if content in visiting:
+                    self.stats["cycles"] += 1
+                    self.logger.warning(f"Block {block.id} refers to tree {content} which contains it.")
+                    continue
+                block.children = self.trees[content]
+                if content not in done:
+                    visit(content)
+            visiting.discard(_id)
+            done.add(_id)
+
+        for root in roots:
+            if root not in done:
+                visit(root)
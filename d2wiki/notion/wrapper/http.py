@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import Counter
+from importlib.util import find_spec
+from typing import Any
+
+import httpx
+
+from d2wiki.types import JSON
+
+HTTP2_AVAILABLE: bool = find_spec("h2") is not None     # httpx needs optional 'h2' package for HTTP/2.
+
+DEFAULT_HTTP_CONFIG: JSON = {
+    "max_connections": 10,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 60.0,
+    "http2": True,
+    "connect_timeout": 5.0,
+    "read_timeout": 15.0,
+    "endpoint_timeouts": {      # read timeout per endpoint, by first segment of api path.
+        "databases": 20.0,
+        "blocks": 15.0,
+        "pages": 10.0,
+        "users": 5.0
+    }
+}
+
+
+class NotionHttpPool:
+    """
+    Long-lived, explicitly configured http connection pool for Notion API.
+    Applies per-endpoint timeouts, and counts requests, new connections and TLS handshakes.
+    """
+    def __init__(self, config: JSON | None = None):
+        config = {**DEFAULT_HTTP_CONFIG, **(config or {})}
+        self.config: JSON = config
+        self.stats: Counter[str] = Counter()
+        self.timeouts: dict[str, httpx.Timeout] = {
+            endpoint: httpx.Timeout(read, connect=config["connect_timeout"])
+            for endpoint, read in config["endpoint_timeouts"].items()
+        }
+        self.default_timeout: httpx.Timeout = httpx.Timeout(config["read_timeout"], connect=config["connect_timeout"])
+        self.http2: bool = config["http2"] and HTTP2_AVAILABLE
+        self.client: httpx.AsyncClient = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"]
+            ),
+            http2=self.http2,
+            event_hooks={"request": [self.on_request], "response": [self.on_response]}
+        )
+
+    @property
+    def timeout_ms(self) -> int:
+        """
+        Default timeout in milliseconds, for notion_client which overrides timeout of the http client.
+        """
+        return int(self.config["read_timeout"] * 1000)
+
+    def timeout_of(self, path: str) -> httpx.Timeout:
+        """
+        Return timeout of the endpoint.
+        :param path: request url path. (ex: /v1/databases/{id}/query)
+        :return: httpx.Timeout of the endpoint.
+        """
+        segments = path.removeprefix("/v1/").split("/", 1)
+        return self.timeouts.get(segments[0], self.default_timeout)
+
+    async def on_request(self, request: httpx.Request) -> None:
+        request.extensions["timeout"] = self.timeout_of(request.url.path).as_dict()
+        request.extensions["trace"] = self.on_trace
+        self.stats["requests"] += 1
+
+    async def on_response(self, response: httpx.Response) -> None:
+        if response.request.extensions.get("stream"):
+            return      # streamed body is counted on close.
+        await response.aread()      # notion_client reads whole body anyway.
+        self.count_response(response)
+
+    def count_response(self, response: httpx.Response) -> None:
+        """
+        Count bytes of response, once its body is read or streamed response is closed.
+        Streamed body may be closed unread, such as on a read error, so only bytes downloaded so far are counted.
+        """
+        self.stats["responses"] += 1
+        if response.request.extensions.get("stream"):
+            self.stats["response_bytes"] += response.num_bytes_downloaded
+        else:
+            self.stats["response_bytes"] += response.num_bytes_downloaded or len(response.content)
+
+    async def on_trace(self, event: str, info: dict[str, Any]) -> None:
+        match event:
+            case "connection.connect_tcp.complete":
+                self.stats["connections"] += 1
+            case "connection.connect_tcp.failed":
+                self.stats["connect_failures"] += 1
+            case "connection.start_tls.complete":
+                self.stats["tls_handshakes"] += 1
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Connection pool metrics.
+        :return: {metric name: value}
+        """
+        requests, connections, responses = self.stats["requests"], self.stats["connections"], self.stats["responses"]
+        reused = requests - connections - self.stats["connect_failures"]
+        return {
+            "http2": self.http2,
+            "requests": requests,
+            "connections": connections,
+            "connect_failures": self.stats["connect_failures"],
+            "tls_handshakes": self.stats["tls_handshakes"],
+            "reused_connection_ratio": round(reused / requests, 3) if requests else 0.0,
+            "response_bytes": self.stats["response_bytes"],     # bytes transferred, before decompression.
+            "bytes_per_response": round(self.stats["response_bytes"] / responses) if responses else 0
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
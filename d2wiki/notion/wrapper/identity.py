@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import weakref
+from collections import Counter
+from typing import Callable, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class IdentityMap:
+    """
+    Notion entities of a wrapper keyed by model class and id, so each id resolves to one shared instance of each model
+    while anything uses it. A database row, its page and a child_page block share the same id, so model class is a part
+    of the key. Entities are held weakly, and dropped once nothing else refers to them.
+    Each entity is stored with its version (`last_edited_time`), and replaced when a newer version arrives.
+    """
+    def __init__(self):
+        # (model class, id) -> (weak reference of entity, version)
+        self.entries: dict[tuple[type, str], tuple[weakref.ref, str]] = {}
+        self.stats: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, kind: Type[T], _id: str, version: str | None = None) -> T | None:
+        """
+        Get shared instance of the entity.
+        :param kind: model class of the entity.
+        :param _id: notion id of the entity.
+        :param version: version the entity must have, or None to accept any version.
+        :return: shared instance, or None if it is not alive or has another version.
+        """
+        entry = self.entries.get((kind, _id))
+        entity = None if entry is None else entry[0]()
+        if entity is None or version is not None and entry[1] != version:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entity
+
+    def put(self, _id: str, entity: T, version: str) -> T:
+        """
+        Store entity as the shared instance of its model class and id, replacing older one.
+        :param _id: notion id of the entity.
+        :param entity: entity object. It must support weak references.
+        :param version: version of the entity.
+        :return: the entity.
+        """
+        key = (type(entity), _id)
+
+        def drop(ref: weakref.ref) -> None:
+            # entry may already hold a newer instance of the same id.
+            if self.entries.get(key, (None, ))[0] is ref:
+                del self.entries[key]
+
+        self.entries[key] = (weakref.ref(entity, drop), version)
+        return entity
+
+    def resolve(self, kind: Type[T], _id: str, version: str, build: Callable[[], T]) -> T:
+        """
+        Return shared instance of the entity if it has the same version, otherwise build and store a new one.
+        :param kind: model class of the entity, which `build` returns.
+        :param _id: notion id of the entity.
+        :param version: version of the entity.
+        :param build: function building the entity.
+        :return: shared instance.
+        """
+        entity = self.get(kind, _id, version)
+        return self.put(_id, build(), version) if entity is None else entity
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Identity map metrics.
+        :return: {metric name: value}
+        """
+        return {
+            "entities": len(self.entries),
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"]
+        }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, TYPE_CHECKING
+
+from d2wiki.notion.models import D2JsonModel, RichText, flat_rich_text, freeze, thaw
+from d2wiki.notion.search import BM25Index, NameSuggester, NameFilter
+from .cache import NegativeCache, QueryCache
+from .columnar import ColumnarTable
+
+if TYPE_CHECKING:
+    from .client import D2NotionWrapper
+
+
+def plain_name(model: D2JsonModel) -> str:
+    """
+    Return plain text name of the model.
+    :param model: D2 model which has `name` field, either plain str or list of RichText, or its compact form.
+    :return: plain text name.
+    """
+    name: str | list[RichText] = getattr(model, "name", "")
+    return name if isinstance(name, str) else flat_rich_text(name)
+
+
+class D2NotionMirror:
+    """
+    Local mirror of Notion database rows.
+    Rows are upserted as they are queried or synced, and every local index is kept in sync from here.
+    Rows of models with `compact_storage` are stored in compact form (see `freeze()`), and rebuilt as models when
+    they are read. Other rows are stored as-is.
+    """
+    def __init__(self, nc: D2NotionWrapper):
+        self.nc: D2NotionWrapper = nc                           # attached to models rebuilt from compact rows.
+        self.rows: dict[str, dict[str, Any]] = {}               # route -> {id: model or its compact form}
+        self.routes: dict[str, str] = {}                        # id -> route
+        self.versions: dict[str, str] = {}                      # id -> last_edited_time
+        self.synced: set[str] = set()                           # routes which are fully synced at least once.
+        self.index: BM25Index = BM25Index()
+        self.names: NameSuggester = NameSuggester()
+        self.name_filters: dict[str, NameFilter] = {}           # route -> known names, built on full sync.
+        self.misses: NegativeCache = NegativeCache()
+        self.queries: QueryCache = QueryCache()
+        self.tables: dict[str, ColumnarTable] = {}             # route -> columnar table of structured fields.
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def get(self, _id: str) -> D2JsonModel | None:
+        """
+        Get mirrored model by its id. Model is rebuilt only if no shared instance of the same version is alive.
+        :param _id: notion id of the row.
+        :return: mirrored model or None if not mirrored.
+        """
+        route = self.routes.get(_id)
+        if route is None:
+            return None
+        row = self.rows[route][_id]
+        if isinstance(row, D2JsonModel):
+            return self.nc.identity.resolve(type(row), _id, self.versions[_id], lambda: row)
+        return self.nc.identity.resolve(type(row).model, _id, self.versions[_id], lambda: thaw(row, self.nc))
+
+    def is_fresh(self, _id: str, last_edited_time: str) -> bool:
+        """
+        Check whether mirrored row is up-to-date.
+        :param _id: notion id of the row.
+        :param last_edited_time: last_edited_time of the row from Notion response.
+        :return: True if row is mirrored with same version.
+        """
+        return self.versions.get(_id) == last_edited_time
+
+    def upsert(self, route: str, model: D2JsonModel, last_edited_time: str) -> bool:
+        """
+        Insert or replace mirrored row.
+        :param route: database id the row belongs to.
+        :param model: D2 model of the row.
+        :param last_edited_time: last_edited_time of the row from Notion response.
+        :return: True if row is newly inserted or changed.
+        """
+        _id: str = getattr(model, "id")
+        changed = not self.is_fresh(_id, last_edited_time) or _id not in self.rows.get(route, {})
+        self.rows.setdefault(route, {})[_id] = freeze(model) if model.compact_storage else model
+        if (table := self.tables.get(route)) is not None:
+            table.upsert(_id, model)
+        self.routes[_id] = route
+        self.versions[_id] = last_edited_time
+        self.nc.identity.put(_id, model, last_edited_time)
+        if changed:
+            self.index.add(_id, f"{plain_name(model)}\n{model.search_text}")
+            self.names.add(_id, plain_name(model))
+            self.misses.invalidate(route)
+            if (name_filter := self.name_filters.get(route)) is not None:
+                name_filter.add(plain_name(model))
+                if name_filter.saturated:
+                    self.build_name_filter(route)
+        return changed
+
+    def build_name_filter(self, route: str) -> None:
+        """
+        (Re)build known-name filter of database from mirrored rows.
+        Removed or renamed rows stay in filter until it is rebuilt, which only causes false positives.
+        :param route: database id.
+        """
+        self.name_filters[route] = NameFilter(map(plain_name, self.rows.get(route, {}).values()))
+
+    def mark_synced(self, route: str) -> None:
+        """
+        Mark database as fully synced, so mirror knows every name in it.
+        :param route: database id.
+        """
+        self.synced.add(route)
+        self.build_name_filter(route)
+        self.misses.invalidate(route)
+
+    def is_known_miss(self, route: str, query: str) -> bool:
+        """
+        Check whether name query on database surely returns nothing, without calling Notion API.
+        :param route: database id.
+        :param query: name query.
+        :return: True if query missed recently, or matches no name of fully synced database.
+        """
+        if (route, query) in self.misses:
+            return True
+        name_filter = self.name_filters.get(route)
+        return name_filter is not None and not name_filter.might_match(query)
+
+    def cached_query(self, route: str, query: str) -> list[D2JsonModel] | None:
+        """
+        Return mirrored rows which the same query returned last time.
+        :param route: database id.
+        :param query: name query.
+        :return: list of mirrored models, or None if query is not cached or any of its rows is gone.
+        """
+        ids = self.queries.get(route, query)
+        if ids is None:
+            return None
+        res = [self.get(_id) for _id in ids]
+        return None if None in res else res
+
+    def match_name(self, route: str, query: str) -> list[D2JsonModel]:
+        """
+        Find mirrored rows whose name contains query, same as name query on Notion.
+        Used as stale fallback while Notion is unavailable.
+        :param route: database id.
+        :param query: name query.
+        :return: list of mirrored models.
+        """
+        query = query.casefold()
+        return [self.get(_id) for _id, m in self.rows.get(route, {}).items() if query in plain_name(m).casefold()]
+
+    def filter(self, route: str, **conditions: Any) -> list[D2JsonModel]:
+        """
+        Find mirrored rows by structured fields, without any Notion API call.
+        :param route: database id, which has a columnar table.
+        :param conditions: column name -> condition. See `ColumnarTable.filter()`.
+        :return: list of mirrored models.
+        """
+        return [self.get(_id) for _id in self.tables[route].filter(**conditions)]
+
+    def remove(self, _id: str) -> None:
+        """
+        Remove mirrored row. Does nothing if row is not mirrored.
+        :param _id: notion id of the row.
+        """
+        route = self.routes.pop(_id, None)
+        if route is None:
+            return
+        del self.rows[route][_id]
+        if (table := self.tables.get(route)) is not None:
+            table.remove(_id)
+        self.versions.pop(_id, None)
+        self.index.remove(_id)
+        self.names.remove(_id)
+
+    def search(self, query: str, limit: int = 10) -> list[D2JsonModel]:
+        """
+        Full-text search over mirrored rows, without any Notion API call.
+        :param query: query text.
+        :param limit: maximum number of results.
+        :return: list of mirrored models ordered by relevance.
+        """
+        return [self.get(doc_id) for doc_id, _ in self.index.search(query, limit)]
+
+    def suggest(self, query: str, routes: Iterable[str] | None = None, limit: int = 5) -> list[D2JsonModel]:
+        """
+        Suggest mirrored rows whose name is similar to query, for queries that matched nothing.
+        :param query: name typed by user.
+        :param routes: database ids to suggest from. Every mirrored database if None.
+        :param limit: maximum number of suggestions.
+        :return: list of mirrored models, closest name first.
+        """
+        accept = None
+        if routes is not None:
+            routes = set(routes)
+            accept = lambda _id: self.routes.get(_id) in routes
+        return [self.get(_id) for _id in self.names.suggest(query, limit, accept=accept)]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+import httpx
+from notion_client import APIResponseError, APIErrorCode
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from d2wiki.types import JSON
+from .deadline import current_deadline, DeadlineExceededError
+from .errors import NotionUnavailableError
+
+T = TypeVar("T")
+
+DEFAULT_RETRY_CONFIG: JSON = {
+    "max_attempts": 4,          # attempts per call, including the first one.
+    "base_delay": 0.5,          # seconds, doubled on each retry.
+    "max_delay": 8.0,           # seconds, cap of backoff and Retry-After.
+    "interaction_budget": 4     # retries shared by every call made for one interaction.
+}
+
+RETRYABLE_CODES: frozenset[APIErrorCode] = frozenset({
+    APIErrorCode.RateLimited,
+    APIErrorCode.ConflictError,
+    APIErrorCode.InternalServerError,
+    APIErrorCode.ServiceUnavailable
+})
+
+
+def is_rate_limited(e: Exception) -> bool:
+    """
+    Check whether Notion call failed because the token is rate-limited.
+    :param e: raised exception.
+    :return: True if response is 429 Too Many Requests.
+    """
+    return isinstance(e, HTTPResponseError) and e.status == 429
+
+
+class RetryBudget:
+    """
+    Retries shared by every Notion call made for one interaction.
+    """
+    def __init__(self, retries: int):
+        self.retries: int = retries
+
+    def spend(self) -> bool:
+        """
+        Spend one retry.
+        :return: False if budget is exhausted.
+        """
+        if self.retries <= 0:
+            return False
+        self.retries -= 1
+        return True
+
+
+current_budget: ContextVar[RetryBudget | None] = ContextVar("current_budget", default=None)
+
+
+@contextmanager
+def retry_budget(retries: int) -> Iterator[RetryBudget]:
+    """
+    Share retry budget across Notion calls made inside this context, including tasks created inside it.
+    :param retries: number of retries allowed.
+    """
+    budget = RetryBudget(retries)
+    token = current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        current_budget.reset(token)
+
+
+class RetryPolicy:
+    """
+    Retry Notion calls on transient errors.
+    Rate-limited calls are retried right away, as NotionSessionPool leaves the throttled token out until Retry-After
+    passes, and waits only if every token is throttled. So bursts slow down instead of failing.
+    5xx responses and timeouts are retried with jittered exponential backoff.
+    """
+    def __init__(self, config: JSON | None = None):
+        config = {**DEFAULT_RETRY_CONFIG, **(config or {})}
+        self.max_attempts: int = config["max_attempts"]
+        self.base_delay: float = config["base_delay"]
+        self.max_delay: float = config["max_delay"]
+        self.interaction_budget: int = config["interaction_budget"]
+        self.stats: Counter[str] = Counter()
+        self.logger = logging.getLogger("d2wiki.notion")
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Retry metrics.
+        :return: {metric name: value}
+        """
+        return {
+            "retries": self.stats["retries"],
+            "rate_limited": self.stats["rate_limited"],
+            "unavailable": self.stats["unavailable"]
+        }
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff.
+        :param attempt: number of attempts made so far.
+        :return: seconds to wait.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def classify(self, e: Exception, attempt: int) -> float | None:
+        """
+        Classify error of Notion call.
+        :param e: raised exception.
+        :param attempt: number of attempts made so far.
+        :return: seconds to wait before retrying, or None if error is not transient.
+        """
+        if is_rate_limited(e):
+            return 0.0      # throttled token waits for Retry-After in session pool.
+        if isinstance(e, APIResponseError):
+            return self.backoff(attempt) if e.code in RETRYABLE_CODES else None
+        if isinstance(e, HTTPResponseError):
+            return self.backoff(attempt) if e.status >= 500 else None
+        if isinstance(e, (RequestTimeoutError, httpx.TransportError)):
+            return self.backoff(attempt)
+        return None
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call Notion API with retries.
+        :param func: function making the call.
+        :return: result of the call.
+        :raise NotionUnavailableError: transient errors persisted beyond attempts or interaction budget.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func()
+            except Exception as e:
+                delay = self.classify(e, attempt)
+                if delay is None:
+                    raise
+                if is_rate_limited(e):
+                    self.stats["rate_limited"] += 1
+                deadline = current_deadline.get()
+                if deadline is not None and deadline.remaining() < delay:
+                    self.stats["unavailable"] += 1
+                    raise DeadlineExceededError(f"No time left to retry Notion call : {e!r}") from e
+                budget = current_budget.get()
+                if attempt >= self.max_attempts or budget is not None and not budget.spend():
+                    self.stats["unavailable"] += 1
+                    raise NotionUnavailableError(f"Notion API failed after {attempt} attempts : {e!r}") from e
+                self.stats["retries"] += 1
+                self.logger.warning(f"Retrying Notion call in {delay:.2f}s ({attempt}/{self.max_attempts}) : {e!r}")
+                if delay > 0:
+                    await asyncio.sleep(delay)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from enum import Enum
+from typing import Any, Callable, Type, TYPE_CHECKING
+
+from d2wiki.types import JSON
+from d2wiki.notion.models import D2JsonModel, PropertyField, RichText
+
+if TYPE_CHECKING:
+    from .client import D2NotionWrapper
+
+RowDecoder = Callable[[JSON], D2JsonModel]
+
+
+class SchemaError(Exception):
+    """
+    Database schema doesn't have a property the model needs, or its type differs.
+    """
+
+
+def rich_text(values: list[JSON]) -> list[RichText]:
+    return [RichText.from_json(**v) for v in values]
+
+
+def plain_text(values: list[JSON]) -> str:
+    # same as flat_rich_text(rich_text(values)), without building RichText objects.
+    return "".join(v["plain_text"] for v in values)
+
+
+def enum_map(enum: Type[Enum], options: list[JSON], route: str, logger: logging.Logger) -> dict[str, Enum]:
+    """
+    Precompute select option name -> Enum member map.
+    :param enum: Enum class of select options.
+    :param options: select options of the property in database schema.
+    :param route: database id, for logging.
+    :param logger: logger to warn options which are not members of the enum.
+    :return: {option name: Enum member}
+    """
+    members = {member.value: member for member in enum}
+    for option in options:
+        if option["name"] not in members:
+            logger.warning(f"Select option '{option['name']}' of database {route} is not a member of {enum.__name__}.")
+    return members
+
+
+def compile_decoder(nc: D2NotionWrapper, route: str, model: Type[D2JsonModel], schema: JSON,
+                    logger: logging.Logger) -> RowDecoder:
+    """
+    Compile row decoder of database from its schema and model's field manifest.
+    Property lookups, type checks and enum maps are resolved once here, so decoding a row only walks
+    the properties model needs.
+    :param nc: notion wrapper attached to decoded models.
+    :param route: database id.
+    :param model: D2 model class of rows, which has `manifest`.
+    :param schema: `properties` of database object.
+    :param logger: logger to warn schema mismatches.
+    :return: function decoding page object of a row into model. It raises KeyError, TypeError or ValueError on bad row.
+    :raise SchemaError: schema doesn't match a required property of model's manifest.
+    """
+    steps: list[tuple[str, str, str, Callable[[Any], Any]]] = []
+    missing: dict[str, None] = {}     # optional fields whose property doesn't match, decoded as None.
+    for field in model.manifest:
+        prop: JSON | None = schema.get(field.property)
+        if prop is None or prop["type"] != field.type:
+            message = f"Database {route} has no {field.type} property '{field.property}' for {model.__name__}.{field.field}."
+            if not field.optional:
+                raise SchemaError(message)
+            logger.warning(f"{message} It is decoded as None.")
+            missing[field.field] = None
+            continue
+        convert = converter(field, prop, route, logger)
+        if field.optional:
+            convert = optional(convert)
+        steps.append((field.field, field.property, field.type, convert))
+
+    def decode(page: JSON) -> D2JsonModel:
+        props: JSON = page["properties"]
+        icon = page.get("icon")
+        return model(
+            nc=nc,
+            id=page["id"],
+            page_url=nc.get_shared_url(page["id"]),
+            img_url=icon[icon["type"]]["url"] if icon is not None and icon["type"] in ("file", "external") else None,
+            **missing,
+            **{name: convert(props[prop][prop_type]) for name, prop, prop_type, convert in steps}
+        )
+    return decode
+
+
+def property_ids(model: Type[D2JsonModel], schema: JSON) -> list[str]:
+    """
+    :return: ids of database properties in model's manifest, for `filter_properties` of database query.
+    """
+    return [schema[field.property]["id"] for field in model.manifest if field.property in schema]
+
+
+def optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    :return: converter which decodes empty value (ex: empty select) as None.
+    """
+    return lambda value: None if value is None else convert(value)
+
+
+def converter(field: PropertyField, prop: JSON, route: str, logger: logging.Logger) -> Callable[[Any], Any]:
+    """
+    :return: function converting raw property value into model field value.
+    """
+    match field.convert:
+        case "plain":
+            return plain_text
+        case "rich":
+            return rich_text
+        case "number":
+            return lambda value: value
+        case enum if isinstance(enum, type) and issubclass(enum, Enum):
+            members = enum_map(enum, prop["select"]["options"], route, logger)
+            return lambda value: members[value["name"]]
+        case _:
+            raise SchemaError(f"Unknown conversion {field.convert!r} of {field.field}.")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator
+
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError
+
+from d2wiki.types import JSON
+from .http import NotionHttpPool
+from .retry import is_rate_limited
+
+
+def retry_after(e: HTTPResponseError) -> float | None:
+    """
+    Parse Retry-After header of rate-limited response.
+    :param e: error of the response.
+    :return: seconds to wait, or None if header is missing or not in seconds.
+    """
+    try:
+        return float(e.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class NotionSession:
+    """
+    Notion integration token with its own client, connection pool and rate-limit state.
+    """
+    def __init__(self, token: str, http_config: JSON | None = None):
+        self.http: NotionHttpPool = NotionHttpPool(http_config)
+        self.client: AsyncClient = AsyncClient(client=self.http.client, auth=token, timeout_ms=self.http.timeout_ms)
+        self.in_flight: int = 0
+        self.throttled_until: float = 0.0      # monotonic time until which this token is rate-limited.
+
+    @property
+    def throttled_for(self) -> float:
+        """
+        Seconds left until this token is usable again, 0 if it is not throttled.
+        """
+        return max(self.throttled_until - monotonic(), 0.0)
+
+    def throttle(self, seconds: float) -> None:
+        """
+        Take this token out of rotation.
+        :param seconds: seconds to keep it out.
+        """
+        self.throttled_until = max(self.throttled_until, monotonic() + seconds)
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            **self.http.metrics(),
+            "in_flight": self.in_flight,
+            "throttled_for": round(self.throttled_for, 3)
+        }
+
+
+class NotionSessionPool:
+    """
+    Spread Notion calls over integration tokens, to raise the rate limit ceiling.
+    Each call goes to the least-loaded token, and a rate-limited token is left out until its Retry-After passes.
+    """
+    def __init__(self, tokens: list[str], http_config: JSON | None = None, max_throttle: float = 8.0, default_throttle: float = 1.0):
+        if not tokens:
+            raise ValueError("At least one notion token is required.")
+        self.sessions: list[NotionSession] = [NotionSession(token, http_config) for token in tokens]
+        self.max_throttle: float = max_throttle             # seconds, cap of Retry-After.
+        self.default_throttle: float = default_throttle     # seconds, used when Retry-After is missing.
+        self.logger = logging.getLogger("d2wiki.notion")
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    async def acquire(self) -> NotionSession:
+        """
+        Pick the least-loaded token which is not rate-limited, waiting if every token is.
+        :return: picked NotionSession.
+        """
+        while True:
+            available = [s for s in self.sessions if s.throttled_for == 0]
+            if available:
+                return min(available, key=lambda s: s.in_flight)
+            await asyncio.sleep(min(s.throttled_for for s in self.sessions))
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[NotionSession]:
+        """
+        Use a token for one Notion call, throttling it if the call is rate-limited.
+        """
+        session = await self.acquire()
+        session.in_flight += 1
+        try:
+            yield session
+        except HTTPResponseError as e:
+            if is_rate_limited(e):
+                seconds = min(retry_after(e) or self.default_throttle, self.max_throttle)
+                session.throttle(seconds)
+                self.logger.warning(f"Notion token #{self.sessions.index(session) + 1} is rate-limited for {seconds:.2f}s.")
+            raise
+        finally:
+            session.in_flight -= 1
+
+    def metrics(self) -> dict[str, dict[str, float]]:
+        """
+        Metrics of each token.
+        :return: {section: {metric name: value}}
+        """
+        return {f"http#{i}": s.metrics() for i, s in enumerate(self.sessions, start=1)}
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(s.http.aclose() for s in self.sessions))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import AsyncIterator
+
+from d2wiki.types import JSON
+from d2wiki.utils.importtime import lazy_import
+
+STREAMING_AVAILABLE: bool = find_spec("ijson") is not None     # incremental decoding needs optional 'ijson' package.
+if STREAMING_AVAILABLE:
+    ijson = lazy_import("ijson")    # loaded by the first streamed response, so it costs nothing if streaming is off.
+
+
+async def iter_items(chunks: AsyncIterator[bytes], prefix: str, meta: JSON) -> AsyncIterator[JSON]:
+    """
+    Decode json body incrementally as chunks arrive, yielding each element of an array as soon as it is complete.
+    Only one element is built at a time, instead of the whole body.
+    :param chunks: async iterator of body chunks. (ex: httpx.Response.aiter_bytes())
+    :param prefix: ijson prefix of array elements to yield. (ex: "results.item")
+    :param meta: dict to fill with top-level scalar values, such as `has_more` and `next_cursor`.
+                 It is complete once iteration finishes.
+    :return: async iterator of decoded elements.
+    """
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builder: ijson.ObjectBuilder | None = None
+    async for chunk in chunks:
+        parser.send(chunk)
+        for path, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+                if path == prefix and event in ("end_map", "end_array"):
+                    yield builder.value
+                    builder = None
+            elif path == prefix and event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif "." not in path and event not in ("map_key", "start_map", "end_map", "start_array", "end_array"):
+                meta[path] = value
+        del events[:]
+    parser.close()
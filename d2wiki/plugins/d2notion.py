@@ -1,11 +1,21 @@
-from typing import cast
+import asyncio
+from typing import cast, Iterable, Callable, Awaitable, Any
 
-from discord import application_command, ApplicationContext, option, SlashCommand, Option
+from discord import application_command, ApplicationContext, option, SlashCommand, Option, ui, Interaction, ButtonStyle
+from discord.ext import tasks
 
 from d2wiki.bot import D2WikiBot
-from d2wiki.notion.wrapper import D2NotionWrapper, D2NotionRoute
+from d2wiki.notion.models import (
+    D2JsonModel, D2Element, D2ElementalWellModType, D2GuardianClass, D2ArmorCategory
+)
+from d2wiki.notion.wrapper import (
+    D2NotionWrapper, D2NotionRoute, D2NotionMirror, plain_name, NotionUnavailableError, SchemaError, retry_budget,
+    Deadline, deadline, RESPONSE_TIMEOUT, DEFERRED_TIMEOUT
+)
 from d2wiki.plugins.plugin_base import PluginBase, extension_helper
 from d2wiki.types import CoroutineFunction
+from d2wiki.utils.admission import AdmissionController, Overloaded
+from d2wiki.utils.quota import Quotas
 
 PerkCategory2Route = {
     "총열/조준경 (1퍽)": D2NotionRoute.Perks.PerkRow1,
@@ -13,6 +23,13 @@ PerkCategory2Route = {
     "특성 (3~4퍽)": D2NotionRoute.Perks.PerkRow34
 }
 
+# Estimated Notion API calls of a name query which misses the cache.
+# Armors render description from top-level paragraphs : one children request per matched row, besides the query.
+# Armor names rarely match more than two rows, and a description fits in the first page of blocks.
+RouteCost = {
+    D2NotionRoute.Exotics.Armors: 1 + 2
+}
+
 
 def query_cmd(name: str, query_handler: CoroutineFunction, ko_name: str, description: str, options: list[Option]) -> SlashCommand:
     cmd_name: str = f"query_{name}"
@@ -31,55 +48,277 @@ def query_cmd(name: str, query_handler: CoroutineFunction, ko_name: str, descrip
     return cast(SlashCommand, cmd)
 
 
+class SuggestionButton(ui.Button):
+    """
+    Button of "did you mean" suggestion, which shows mirrored entity when clicked.
+    """
+    def __init__(self, mirror: D2NotionMirror, model: D2JsonModel):
+        super(SuggestionButton, self).__init__(label=plain_name(model)[:80], style=ButtonStyle.secondary)
+        self.mirror: D2NotionMirror = mirror
+        self.entity_id: str = getattr(model, "id")
+
+    async def callback(self, interaction: Interaction):
+        model = self.mirror.get(self.entity_id)
+        if model is None:
+            return await interaction.response.edit_message(content="더 이상 존재하지 않는 항목입니다.🤔", view=None)
+        await interaction.response.edit_message(content=None, embed=model.embed, view=None)
+        self.view.stop()
+
+
+def suggestion_view(mirror: D2NotionMirror, suggestions: list[D2JsonModel]) -> ui.View:
+    """
+    Suggestion View generator.
+    :param mirror: D2NotionMirror to resolve suggested entities from.
+    :param suggestions: list of suggested models.
+    :return: ui.View object.
+    """
+    return ui.View(*[SuggestionButton(mirror, m) for m in suggestions], disable_on_timeout=True)
+
+
 class D2NotionPlugin(PluginBase):
     def __init__(self, bot: D2WikiBot):
         super(D2NotionPlugin, self).__init__(bot)
-        self.notion: D2NotionWrapper = D2NotionWrapper(self.bot.config["notion"])
+        self.notion: D2NotionWrapper = self.adopt("notion", lambda: D2NotionWrapper(self.bot.config["notion"]))
+        self.stale_while_revalidate: bool = self.bot.config["notion"].get("stale_while_revalidate", True)
+        self.revalidations: set[asyncio.Task] = set()       # keep references of background revalidation tasks.
+        self.defer_budget: float = self.bot.config["notion"].get("defer_budget", 0.5)     # seconds
+        deadline_config = self.bot.config["notion"].get("deadline", {})
+        self.safety_margin: float = deadline_config.get("safety_margin", 0.5)      # seconds kept to send the reply itself.
+        self.deferred_budget: float = min(deadline_config.get("deferred", 60.0), DEFERRED_TIMEOUT)     # seconds
+        # shared with handlers of the replaced plugin which are still running, so both are limited together.
+        self.admission: AdmissionController = self.adopt(
+            "admission", lambda: AdmissionController(**self.bot.config["notion"].get("admission", {}))
+        )
+        self.quotas: Quotas = self.adopt("quotas", lambda: Quotas(self.bot.config["notion"].get("quota")))
+        self.sync_mirror.start()
+
+    def cog_unload(self) -> None:
+        self.sync_mirror.cancel()
+        for task in self.revalidations:
+            task.cancel()
+        super(D2NotionPlugin, self).cog_unload()
+
+    def handoff(self) -> dict[str, Any]:
+        # wrapper holds http connection pool, mirror, its indexes and caches.
+        return {"notion": self.notion, "admission": self.admission, "quotas": self.quotas}
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {
+            "admission": self.admission.metrics(),
+            "quota": self.quotas.metrics(),
+            **self.notion.metrics()
+        }
+
+    async def aclose(self) -> None:
+        if "notion" not in self.handed_off:
+            await self.notion.aclose()
+
+    @tasks.loop(minutes=10)
+    async def sync_mirror(self):
+        """
+        Periodically sync notion databases into local mirror, which backs the full-text search.
+        """
+        try:
+            changed = await self.notion.sync()
+        except NotionUnavailableError as e:
+            # keep the loop running, so mirror is synced again once Notion recovers.
+            return self.logger.warning(f"Skipped syncing notion mirror : {e}")
+        except Exception as e:
+            # any exception escaping here stops the loop for good.
+            return self.logger.error(f"Error occurred while syncing notion mirror : {e!r}")
+        self.logger.info(f"Synced notion mirror : {changed} rows changed, {len(self.notion.mirror)} rows total.")
+
+    @sync_mirror.before_loop
+    async def before_sync_mirror(self):
+        await self.bot.wait_until_ready()
+
+    @sync_mirror.error
+    async def on_sync_mirror_error(self, e: BaseException):
+        self.logger.error(f"Error occurred while syncing notion mirror : {e!r}")
+
+    async def respond_result(self, ctx: ApplicationContext, result: list[D2JsonModel], query: str, routes: Iterable[str]):
+        """
+        Respond with the first result, or with "did you mean" suggestions if nothing matched.
+        :param ctx: ApplicationContext of the command.
+        :param result: list of queried models.
+        :param query: query typed by user.
+        :param routes: database ids the command searches, to suggest from.
+        """
+        try:
+            res = result[0]
+            await ctx.respond(embed=res.embed)
+        except IndexError:
+            suggestions = self.notion.mirror.suggest(query, routes)
+            if suggestions:
+                await ctx.respond(content="검색 결과가 없습니다.🤔 혹시 이것을 찾으셨나요?", view=suggestion_view(self.notion.mirror, suggestions))
+            else:
+                await ctx.respond(content="검색 결과가 없습니다.🤔")
+
+    async def fetch_within_budget(self, ctx: ApplicationContext, fetch: Callable[[], Awaitable[list[D2JsonModel]]],
+                                  interaction_deadline: Deadline) -> list[D2JsonModel]:
+        """
+        Fetch result, deferring the interaction only if it is not ready within the defer budget.
+        Results answered locally (cached misses, known-name filter) are replied directly without a defer round trip.
+        :param ctx: ApplicationContext of the command.
+        :param fetch: coroutine function which queries Notion.
+        :param interaction_deadline: deadline of the interaction, extended once it is deferred.
+        :return: fetched result.
+        """
+        task = asyncio.ensure_future(fetch())
+        done, _ = await asyncio.wait({task}, timeout=self.defer_budget)
+        if not done:
+            await ctx.defer()
+            interaction_deadline.extend(self.deferred_budget - self.safety_margin)
+        return await task
+
+    async def respond_query(self, ctx: ApplicationContext, route: str, query: str,
+                            fetch: Callable[[], Awaitable[list[D2JsonModel]]]):
+        """
+        Respond to name query command.
+        In stale-while-revalidate mode, cached result is replied immediately and refreshed in background.
+        Otherwise, or if query is not cached, result is fetched before replying, deferring only when it takes long.
+        :param ctx: ApplicationContext of the command.
+        :param route: database id the command searches.
+        :param query: query typed by user.
+        :param fetch: coroutine function which queries Notion.
+        """
+        cached = self.notion.mirror.cached_query(route, query) if self.stale_while_revalidate else None
+        upstream = not cached and not self.notion.mirror.is_known_miss(route, query)
+        cost = RouteCost.get(route, 1) if upstream else self.quotas.cache_hit_cost
+        if self.quotas.acquire(ctx.author.id, ctx.guild_id, cost) > 0:
+            return await self.respond_stale(ctx, route, query, reason="요청이 너무 잦아")
+        if not cached:
+            try:
+                with deadline(RESPONSE_TIMEOUT - self.safety_margin) as interaction_deadline:
+                    async with self.admission.admit():
+                        with retry_budget(self.notion.retry.interaction_budget):
+                            result = await self.fetch_within_budget(ctx, fetch, interaction_deadline)
+            except Overloaded as e:
+                self.logger.warning(f"Shed name query : {e}")
+                return await self.respond_stale(ctx, route, query, reason="요청이 많아")
+            except NotionUnavailableError as e:
+                self.logger.warning(f"Notion is unavailable : {e}")
+                return await self.respond_stale(ctx, route, query, reason="노션 서버가 응답하지 않아")
+            except SchemaError as e:
+                self.logger.error(f"Database doesn't match its model : {e}")
+                return await self.respond_stale(ctx, route, query, reason="노션 데이터베이스 구성이 바뀌어")
+            return await self.respond_result(ctx, result, query, [route])
+
+        shown = cached[0]
+        embed = shown.embed
+        await ctx.respond(embed=embed)
+        # reply is already sent, so revalidation only needs to finish before the interaction token expires.
+        with retry_budget(self.notion.retry.interaction_budget), deadline(self.deferred_budget - self.safety_margin):
+            task = asyncio.create_task(self.revalidate(
+                ctx, getattr(shown, "id"), self.notion.mirror.versions.get(getattr(shown, "id")), embed.to_dict(), fetch
+            ))
+        self.revalidations.add(task)
+        task.add_done_callback(self.revalidations.discard)
+
+    async def respond_stale(self, ctx: ApplicationContext, route: str, query: str, reason: str):
+        """
+        Respond from the last known mirrored rows when query can't reach Notion, marked as possibly stale.
+        :param ctx: ApplicationContext of the command.
+        :param route: database id the command searches.
+        :param query: query typed by user.
+        :param reason: why Notion is not queried, shown to user. (ex: "요청이 많아")
+        """
+        stale = self.notion.mirror.cached_query(route, query) or self.notion.mirror.match_name(route, query)
+        if not stale:
+            return await ctx.respond(content=f"{reason} 처리할 수 없습니다. 잠시 후 다시 시도해주세요.😥")
+        await ctx.respond(content=f"⚠️ {reason} 저장된 정보를 보여드립니다. 최신 정보가 아닐 수 있습니다.", embed=stale[0].embed)
+
+    async def revalidate(self, ctx: ApplicationContext, shown_id: str, shown_version: str | None, shown_embed: dict,
+                         fetch: Callable[[], Awaitable[list[D2JsonModel]]]):
+        """
+        Refresh replied result from Notion, and edit the reply only if the row actually changed.
+        :param ctx: ApplicationContext of the command.
+        :param shown_id: id of the replied row.
+        :param shown_version: last_edited_time of the replied row.
+        :param shown_embed: replied embed as dict.
+        :param fetch: coroutine function which queries Notion.
+        """
+        try:
+            async with self.admission.admit():
+                res = await fetch()
+        except Overloaded:
+            return      # cached reply is already sent, so revalidation is the first work to shed.
+        except Exception as e:
+            self.logger.warning(f"Failed to revalidate cached result : {e!r}")
+            return
+        if not res:
+            return
+        fresh = res[0]
+        fresh_id: str = getattr(fresh, "id")
+        if fresh_id == shown_id and self.notion.mirror.versions.get(fresh_id) == shown_version:
+            return
+        embed = fresh.embed
+        if embed.to_dict() != shown_embed:
+            await ctx.edit(embed=embed)
 
     @application_command(name="query_perks", name_localizations={"ko": "특성"}, description="무기 특성을 검색합니다.")
     @option(name="category", description="검색할 특성의 종류", required=True, choices=list(PerkCategory2Route.keys()))
     @option(name="query", description="검색할 특성의 이름.", required=True, type=str)
     async def query_perks(self, ctx: ApplicationContext, category: str, query: str):
-        await ctx.defer()
-        query = (await self.notion.query_perks(PerkCategory2Route[category], query))
-        try:
-            res = query[0]
-            await ctx.respond(embed=res.embed)
-        except IndexError:
-            await ctx.respond(content="검색 결과가 없습니다.🤔")
+        route = PerkCategory2Route[category]
+        await self.respond_query(ctx, route, query, lambda: self.notion.query_perks(route, query))
 
     @application_command(name="query_exotic_armors", name_localizations={"ko": "경이방어구"}, description="경이 방어구를 검색합니다.")
     @option(name="query", description="검색할 경이 방어구의 이름.", required=True, type=str)
     async def query_exotic_armors(self, ctx: ApplicationContext, query: str):
-        await ctx.defer()
-        query = (await self.notion.query_exotic_armor(query))
-        try:
-            res = query[0]
-            await ctx.respond(embed=res.embed)
-        except IndexError:
-            await ctx.respond(content="검색 결과가 없습니다.🤔")
+        await self.respond_query(ctx, D2NotionRoute.Exotics.Armors, query, lambda: self.notion.query_exotic_armor(query))
 
     @application_command(name="query_exotic_weapons", name_localizations={"ko": "경이무기"}, description="경이 무기를 검색합니다.")
     @option(name="query", description="검색할 경이 무기의 이름.", required=True, type=str)
     async def query_exotic_weapons(self, ctx: ApplicationContext, query: str):
-        await ctx.defer()
-        query = (await self.notion.query_exotic_weapon(query))
-        try:
-            res = query[0]
-            await ctx.respond(embed=res.embed)
-        except IndexError:
-            await ctx.respond(content="검색 결과가 없습니다.🤔")
+        await self.respond_query(ctx, D2NotionRoute.Exotics.Weapons, query, lambda: self.notion.query_exotic_weapon(query))
 
     @application_command(name="query_wells", name_localizations={"ko": "원소샘"}, description="원소 샘 개조부품을 검색합니다.")
     @option(name="query", description="검색할 원소 샘 개조부품의 이름.", required=True, type=str)
     async def query_wells(self, ctx: ApplicationContext, query: str):
-        await ctx.defer()
-        query = (await self.notion.query_elemental_well(query))
-        try:
-            res = query[0]
-            await ctx.respond(embed=res.embed)
-        except IndexError:
-            await ctx.respond(content="검색 결과가 없습니다.🤔")
+        await self.respond_query(ctx, D2NotionRoute.CombatStyleMods.ElementalWells, query, lambda: self.notion.query_elemental_well(query))
+
+    async def respond_filtered(self, ctx: ApplicationContext, route: str, **conditions: Any):
+        """
+        Respond with mirrored rows matching structured conditions.
+        :param ctx: ApplicationContext of the command.
+        :param route: database id to filter.
+        :param conditions: column name -> condition. See `ColumnarTable.filter()`.
+        """
+        if route not in self.notion.mirror.synced:
+            return await ctx.respond(content="아직 노션 데이터를 불러오는 중입니다. 잠시 후 다시 시도해주세요.😥")
+        res = self.notion.filter(route, **conditions)
+        if not res:
+            return await ctx.respond(content="검색 결과가 없습니다.🤔")
+        others = "\n".join(map(lambda m: f"- {plain_name(m)}", res[1:21]))
+        if len(res) > 21:
+            others += f"\n... 외 {len(res) - 21}개"
+        await ctx.respond(content=f"다른 검색 결과 :\n{others}" if others else None, embed=res[0].embed)
+
+    @application_command(name="filter_wells", name_localizations={"ko": "원소샘필터"}, description="조건에 맞는 원소 샘 개조부품을 찾습니다.")
+    @option(name="element", description="원소 유형", required=False, choices=[e.value for e in D2Element])
+    @option(name="mod_type", description="개조부품 유형", required=False, choices=[t.value for t in D2ElementalWellModType])
+    @option(name="max_cost", description="최대 에너지 사용량", required=False, type=int)
+    async def filter_wells(self, ctx: ApplicationContext, element: str = None, mod_type: str = None, max_cost: int = None):
+        await self.respond_filtered(
+            ctx, D2NotionRoute.CombatStyleMods.ElementalWells,
+            element=element, mod_type=mod_type, cost=None if max_cost is None else ("<=", max_cost)
+        )
+
+    @application_command(name="filter_exotic_armors", name_localizations={"ko": "경이방어구필터"}, description="조건에 맞는 경이 방어구를 찾습니다.")
+    @option(name="guardian_class", description="직업", required=False, choices=[c.value for c in D2GuardianClass])
+    @option(name="category", description="부위", required=False, choices=[c.value for c in D2ArmorCategory])
+    async def filter_exotic_armors(self, ctx: ApplicationContext, guardian_class: str = None, category: str = None):
+        await self.respond_filtered(ctx, D2NotionRoute.Exotics.Armors, guardian_class=guardian_class, category=category)
+
+    @application_command(name="search", name_localizations={"ko": "검색"}, description="설명과 본문에서 검색어가 포함된 항목을 찾습니다.")
+    @option(name="query", description="검색할 내용. (예: 재장전 속도)", required=True, type=str)
+    async def search(self, ctx: ApplicationContext, query: str):
+        res = self.notion.search(query, limit=6)
+        if not res:
+            return await ctx.respond(content="검색 결과가 없습니다.🤔")
+        others = "\n".join(map(lambda m: f"- {plain_name(m)}", res[1:]))
+        await ctx.respond(content=f"다른 검색 결과 :\n{others}" if others else None, embed=res[0].embed)
 
 
 setup, teardown = extension_helper(D2NotionPlugin)
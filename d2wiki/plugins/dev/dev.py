@@ -1,12 +1,13 @@
 from typing import Final
 
-from discord import application_command, ApplicationContext, SlashCommandGroup, CheckFailure, Embed, Color
+from discord import application_command, ApplicationContext, SlashCommandGroup, CheckFailure, Embed, Color, User, option
 from discord.ext.commands import check
 
 from d2wiki.bot import D2WikiBot
 from d2wiki.plugins.dev.contributors import Contributor
 from d2wiki.plugins.dev.plugin_views import PluginManageMode, plugin_view
 from d2wiki.plugins.plugin_base import PluginBase
+from d2wiki.utils.quota import Quotas
 
 
 def check_dev():
@@ -78,6 +79,70 @@ class DevPlugin(PluginBase):
         else:
             return await ctx.respond("이유는 모르겠지만 오류가 발생했어요! <@!280855156608860160>")
 
+    @application_command(name="importtime", description="플러그인을 불러오는 데 걸린 시간을 모듈별로 보여줍니다.")
+    @check_dev()
+    async def cmd_importtime(self, ctx: ApplicationContext):
+        if self.bot.import_timer is None:
+            return await ctx.respond("측정된 기록이 없습니다.", ephemeral=True)
+        await ctx.respond(f"```\n{self.bot.import_timer.report()}\n```", ephemeral=True)
+
+    @cmd_importtime.error
+    async def on_importtime_error(self, ctx: ApplicationContext, e):
+        if isinstance(e, CheckFailure):
+            return await ctx.respond("당신에게는 봇의 정보를 볼 권한이 없습니다.", ephemeral=True)
+        else:
+            return await ctx.respond("이유는 모르겠지만 오류가 발생했어요! <@!280855156608860160>")
+
+    @application_command(name="metrics", description="플러그인들의 측정 지표를 보여줍니다.")
+    @check_dev()
+    async def cmd_metrics(self, ctx: ApplicationContext):
+        e = Embed(title="측정 지표", color=Color.blurple())
+        for cog in self.bot.cogs.values():
+            if not isinstance(cog, PluginBase):
+                continue
+            for section, values in cog.metrics().items():
+                e.add_field(
+                    name=f"{cog.qualified_name}.{section}",
+                    value="\n".join(f"{k} : `{v}`" for k, v in values.items()) or "-",
+                    inline=False
+                )
+        await ctx.respond(embed=e, ephemeral=True)
+
+    @cmd_metrics.error
+    async def on_metrics_error(self, ctx: ApplicationContext, e):
+        if isinstance(e, CheckFailure):
+            return await ctx.respond("당신에게는 봇의 정보를 볼 권한이 없습니다.", ephemeral=True)
+        else:
+            return await ctx.respond("이유는 모르겠지만 오류가 발생했어요! <@!280855156608860160>")
+
+    @application_command(name="quota", description="사용자와 서버의 남은 요청 한도를 보여줍니다.")
+    @option(name="user", description="한도를 확인할 사용자. (기본값: 자신)", required=False, type=User)
+    @check_dev()
+    async def cmd_quota(self, ctx: ApplicationContext, user: User | None = None):
+        user = user or ctx.author
+        e = Embed(title=f"{user} 의 요청 한도", color=Color.blurple())
+        for cog in self.bot.cogs.values():
+            quotas = getattr(cog, "quotas", None)
+            if not isinstance(quotas, Quotas):
+                continue
+            status = quotas.status(user.id, ctx.guild_id)
+            e.add_field(
+                name=cog.qualified_name,
+                value="\n".join(
+                    f"{key} : `{tokens}` / `{table.capacity}` (초당 `{table.rate}`)"
+                    for key, tokens, table in zip(status.keys(), status.values(), (quotas.users, quotas.guilds))
+                ),
+                inline=False
+            )
+        await ctx.respond(embed=e, ephemeral=True)
+
+    @cmd_quota.error
+    async def on_quota_error(self, ctx: ApplicationContext, e):
+        if isinstance(e, CheckFailure):
+            return await ctx.respond("당신에게는 봇의 정보를 볼 권한이 없습니다.", ephemeral=True)
+        else:
+            return await ctx.respond("이유는 모르겠지만 오류가 발생했어요! <@!280855156608860160>")
+
     @grp_plugin.command(name="load", description="플러그인을 불러옵니다.")
     @check_dev()
     async def cmd_load_plugin(self, ctx: ApplicationContext):
@@ -4,6 +4,7 @@ from typing import Iterable
 from discord import ui, Interaction, SelectOption
 
 from d2wiki.bot import D2WikiBot
+from d2wiki.utils.importtime import ImportTimer
 
 
 class PluginManageMode(Enum):
@@ -38,9 +39,12 @@ class PluginSelect(ui.Select):
         for t in targets:
             self.bot.unload_extension(t[0])     # unload using name
 
-    def reload_ext(self, targets: Iterable[tuple[str, str]]):
-        for t in targets:
-            self.bot.reload_extension(t[1])     # reload using path
+    def reload_ext(self, targets: Iterable[tuple[str, str]]) -> ImportTimer:
+        with ImportTimer() as timer:
+            for t in targets:
+                with timer.measure(t[1]):
+                    self.bot.reload_extension(t[1])     # reload using path
+        return timer
 
     async def callback(self, interaction: Interaction):
         await interaction.response.defer()
@@ -59,9 +63,10 @@ class PluginSelect(ui.Select):
                     ephemeral=True
                 )
             case PluginManageMode.RELOAD:
-                self.reload_ext(targets)
+                timer = self.reload_ext(targets)
                 await interaction.followup.send(
-                    "다음의 플러그인을 다시 불러왔습니다.\n" + "\n".join(map(lambda name: f"- `{name}`", targets)),
+                    "다음의 플러그인을 다시 불러왔습니다.\n"
+                    + "\n".join(map(lambda target: f"- `{target[1]}` ({timer.inclusive[target[1]] * 1000:.1f}ms)", targets)),
                     ephemeral=True
                 )
         self.view.stop()
@@ -1,10 +1,13 @@
-from typing import Type
+import asyncio
+from typing import Type, Any, Callable, TypeVar
 
 from discord import Cog
 
 from d2wiki.bot import D2WikiBot
 from d2wiki.utils.log import get_logger
 
+T = TypeVar("T")
+
 
 class PluginBase(Cog):
     def __init_subclass__(cls, **kwargs):
@@ -13,6 +16,7 @@ class PluginBase(Cog):
 
     def __init__(self, bot: D2WikiBot):
         self.bot: D2WikiBot = bot
+        self.handed_off: set[str] = set()      # keys of state handed off to the replacing plugin on reload.
         self.logger = get_logger(
             f"d2wiki.{self.qualified_name}",
             stream=True,
@@ -21,7 +25,49 @@ class PluginBase(Cog):
         )
         self.logger.info("Plugin loaded.")
 
+    def adopt(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Take state handed off by the plugin this one replaces on reload, or create it if there is none.
+        :param key: key of the state in `handoff()` of the replaced plugin.
+        :param factory: function creating the state from scratch.
+        :return: adopted or created state.
+        """
+        state = self.bot.plugin_states.get(self.qualified_name, {})
+        if key in state:
+            self.logger.info(f"Adopted '{key}' from replaced plugin.")
+            return state.pop(key)
+        return factory()
+
+    def handoff(self) -> dict[str, Any]:
+        """
+        Hand off expensive state (connection pools, caches, indexes...) to the replacing plugin on reload.
+        This plugin keeps referring to the state, so its handlers which are still running keep working with it.
+        Handed off state is owned by the replacing plugin, so `aclose()` of this plugin must skip keys in `handed_off`.
+        :return: {key: state} to be adopted by the replacing plugin.
+        """
+        return {}
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """
+        Metrics of this plugin, shown by `/metrics` command of Dev plugin.
+        :return: {section: {metric name: value}}
+        """
+        return {}
+
+    async def aclose(self) -> None:
+        """
+        Close resources still owned by this plugin. Called when plugin is unloaded, after `handoff()` on reload.
+        """
+
     def cog_unload(self) -> None:
+        if self.bot.reloading:
+            state = self.handoff()
+            self.handed_off.update(state.keys())
+            self.bot.plugin_states[self.qualified_name] = state
+        try:
+            asyncio.get_running_loop().create_task(self.aclose())
+        except RuntimeError:    # no running loop, nothing to close asynchronously.
+            pass
         self.logger.info("Plugin unloaded.")
 
 
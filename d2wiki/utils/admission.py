@@ -0,0 +1,93 @@
+"""
+Admission control for bursty workloads.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator
+
+__all__ = ("AdmissionController", "Overloaded")
+
+
+class Overloaded(Exception):
+    """
+    Work is shed instead of being admitted, because the controller is saturated.
+    """
+    def __init__(self, reason: str):
+        super(Overloaded, self).__init__(f"Work is shed : {reason}")
+        self.reason: str = reason
+
+
+class AdmissionController:
+    """
+    Bounded work queue in front of a limited number of concurrent workers.
+    Work waits in queue for a free slot, and is shed when queue is full or it waited longer than queue timeout.
+    Usage :
+        try:
+            async with controller.admit():
+                await work()
+        except Overloaded:
+            ...
+    """
+    def __init__(self, concurrency: int = 8, queue_size: int = 32, queue_timeout: float = 1.0):
+        self.concurrency: int = concurrency
+        self.queue_size: int = queue_size
+        self.queue_timeout: float = queue_timeout      # seconds
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self.running: int = 0
+        self.waiting: int = 0
+        self.queue_time_max: float = 0.0
+        self.queue_time_total: float = 0.0
+        self.stats: Counter[str] = Counter()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a worker slot while this context is active.
+        :raise Overloaded: queue is full, or no slot is freed within queue timeout.
+        """
+        started = monotonic()
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()      # free slot is taken without suspending.
+        elif self.waiting >= self.queue_size:
+            self.stats["shed_full"] += 1
+            raise Overloaded("queue is full")
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats["shed_timeout"] += 1
+                raise Overloaded("queue timeout") from None
+            finally:
+                self.waiting -= 1
+        waited = monotonic() - started
+        self.queue_time_max = max(self.queue_time_max, waited)
+        self.queue_time_total += waited
+        self.stats["admitted"] += 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Queue and shed metrics.
+        :return: {metric name: value}
+        """
+        admitted = self.stats["admitted"]
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": admitted,
+            "shed_full": self.stats["shed_full"],
+            "shed_timeout": self.stats["shed_timeout"],
+            "queue_time_avg_ms": round(self.queue_time_total / admitted * 1000, 2) if admitted else 0.0,
+            "queue_time_max_ms": round(self.queue_time_max * 1000, 2)
+        }
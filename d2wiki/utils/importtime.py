@@ -0,0 +1,140 @@
+"""
+Import time instrumentation, and lazy import of heavy optional dependencies.
+"""
+from __future__ import annotations
+
+import builtins
+import sys
+from contextlib import contextmanager
+from importlib.util import LazyLoader, find_spec, module_from_spec, resolve_name
+from time import perf_counter
+from types import ModuleType
+from typing import Iterator
+
+__all__ = ("ImportTimer", "lazy_import")
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module which is executed on its first attribute access, instead of now.
+    Use it for heavy dependencies only a few code paths need, so importing their users stays cheap.
+    Usage :
+        numpy = lazy_import("numpy")     # nothing is loaded yet.
+        numpy.zeros(3)                    # numpy is imported here.
+    :param name: absolute module name.
+    :return: module, loaded already or on first use.
+    :raise ModuleNotFoundError: module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    spec.loader = LazyLoader(spec.loader)
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class ImportTimer:
+    """
+    Measure time spent on importing each module for the first time, while this context is active.
+    Only `import` statements are traced. Modules imported through importlib are measured by the caller.
+    Usage :
+        with ImportTimer() as timer:
+            import something
+        print(timer.report())
+    """
+    def __init__(self):
+        self.inclusive: dict[str, float] = {}   # module -> seconds including nested imports
+        self.exclusive: dict[str, float] = {}   # module -> seconds excluding nested imports
+        self._stack: list[float] = []           # accumulated nested import time of each active frame
+        self._import = builtins.__import__
+
+    def __enter__(self) -> ImportTimer:
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, *exc) -> None:
+        builtins.__import__ = self._import
+
+    def _timed_import(self, name: str, globals=None, locals=None, fromlist=(), level: int = 0):
+        fullname = name
+        if level > 0 and globals is not None:
+            fullname = resolve_name("." * level + name, globals.get("__package__") or globals.get("__name__"))
+        if fullname in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        with self.measure(fullname):
+            return self._import(name, globals, locals, fromlist, level)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Measure import done outside of `import` statement, such as extensions loaded through importlib.
+        :param name: module name to record time as.
+        """
+        self._stack.append(0.0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            nested = self._stack.pop()
+            self.inclusive[name] = self.inclusive.get(name, 0.0) + elapsed
+            self.exclusive[name] = self.exclusive.get(name, 0.0) + elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    @property
+    def total(self) -> float:
+        """
+        Total seconds spent on top-level imports.
+        """
+        return sum(self.exclusive.values())
+
+    def report(self, limit: int = 15) -> str:
+        """
+        Per-module import time breakdown, slowest first.
+        :param limit: maximum number of modules to list.
+        :return: report text.
+        """
+        lines = [f"{'self(ms)':>9} {'total(ms)':>10}  module"]
+        for name, t in sorted(self.exclusive.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            lines.append(f"{t * 1000:9.1f} {self.inclusive[name] * 1000:10.1f}  {name}")
+        lines.append(f"{'':>9} {self.total * 1000:10.1f}  (total)")
+        return "\n".join(lines)
+
+
+def main() -> int:
+    """
+    Import modules in a fresh interpreter and check total import time against budget.
+    Usage : python -m d2wiki.utils.importtime [--budget MS] [--preload module ...] module [module ...]
+    :return: exit code. 1 if import time exceeded budget.
+    """
+    from argparse import ArgumentParser
+    from importlib import import_module
+
+    parser = ArgumentParser(description="Per-module import time breakdown with budget check.")
+    parser.add_argument("modules", nargs="+", help="modules to import.")
+    parser.add_argument("--budget", type=float, default=None, help="import time budget in milliseconds.")
+    parser.add_argument("--limit", type=int, default=15, help="number of modules to list.")
+    parser.add_argument("--preload", nargs="*", default=[], help="modules the bot has loaded already. (ex: discord)")
+    args = parser.parse_args()
+
+    for module in args.preload:
+        import_module(module)       # not measured.
+
+    with ImportTimer() as timer:
+        for module in args.modules:
+            with timer.measure(module):
+                import_module(module)
+    print(timer.report(args.limit))
+    if args.budget is not None and timer.total * 1000 > args.budget:
+        print(f"Import time {timer.total * 1000:.1f}ms exceeded budget {args.budget:.1f}ms.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
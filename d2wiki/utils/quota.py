@@ -0,0 +1,148 @@
+"""
+Token-bucket request quotas.
+"""
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from time import monotonic
+from typing import Any
+
+__all__ = ("TokenBucket", "QuotaTable", "Quotas")
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at constant rate, up to its capacity.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate: float = rate             # tokens per second
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = monotonic()
+
+    def refill(self) -> float:
+        """
+        Refill tokens accumulated since last update.
+        :return: tokens available now.
+        """
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def retry_after(self, cost: float) -> float:
+        """
+        :param cost: tokens to take. Cost above capacity is clamped to capacity, so it takes a full bucket.
+        :return: seconds until bucket holds enough tokens, 0 if it already does.
+        """
+        missing = min(cost, self.capacity) - self.refill()
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, cost: float) -> None:
+        """
+        Take tokens. Caller checks `retry_after()` first.
+        :param cost: tokens to take. Cost above capacity is clamped to capacity.
+        """
+        self.refill()
+        self.tokens -= min(cost, self.capacity)
+
+
+class QuotaTable:
+    """
+    Token buckets keyed by id, such as user or guild id.
+    Least recently used buckets are dropped beyond max_keys, which only refills them early.
+    """
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.max_keys: int = max_keys
+        self.buckets: OrderedDict[int, TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def bucket(self, key: int) -> TokenBucket:
+        """
+        Get bucket of the key, creating a full one if there is none.
+        :param key: id owning the bucket.
+        :return: TokenBucket of the key.
+        """
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.capacity)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket
+
+
+class Quotas:
+    """
+    Per-user and per-guild quotas. A request is admitted only if both of its buckets hold enough tokens.
+    """
+    def __init__(self, config: dict[str, Any] | None = None):
+        config = config or {}
+        user, guild = config.get("user", {}), config.get("guild", {})
+        self.users: QuotaTable = QuotaTable(user.get("rate", 0.2), user.get("capacity", 5))
+        self.guilds: QuotaTable = QuotaTable(guild.get("rate", 2.0), guild.get("capacity", 30))
+        self.cache_hit_cost: float = config.get("cache_hit_cost", 0)
+        self.stats: Counter[str] = Counter()
+
+    def buckets(self, user_id: int, guild_id: int | None) -> list[TokenBucket]:
+        """
+        :return: buckets the request is charged to.
+        """
+        return [self.users.bucket(user_id)] + ([self.guilds.bucket(guild_id)] if guild_id is not None else [])
+
+    def acquire(self, user_id: int, guild_id: int | None, cost: float) -> float:
+        """
+        Charge request to user's and guild's quota.
+        :param user_id: id of the requesting user.
+        :param guild_id: id of the guild request is made in, or None in direct messages.
+        :param cost: estimated cost of the request.
+        :return: 0 if request is admitted and charged, otherwise seconds to wait before retrying.
+        """
+        if cost <= 0:
+            self.stats["free"] += 1
+            return 0.0
+        buckets = self.buckets(user_id, guild_id)
+        retry_after = max(b.retry_after(cost) for b in buckets)
+        if retry_after > 0:
+            self.stats["throttled"] += 1
+            return retry_after
+        for b in buckets:
+            b.take(cost)
+        self.stats["charged"] += 1
+        self.stats["tokens"] += cost
+        return 0.0
+
+    def status(self, user_id: int, guild_id: int | None) -> dict[str, float]:
+        """
+        Remaining tokens of user's and guild's quota.
+        :param user_id: id of the user.
+        :param guild_id: id of the guild, or None.
+        :return: {"user": tokens, "guild": tokens}
+        """
+        status = {"user": round(self.users.bucket(user_id).refill(), 2)}
+        if guild_id is not None:
+            status["guild"] = round(self.guilds.bucket(guild_id).refill(), 2)
+        return status
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Quota metrics.
+        :return: {metric name: value}
+        """
+        return {
+            "users": len(self.users),
+            "guilds": len(self.guilds),
+            "free": self.stats["free"],
+            "charged": self.stats["charged"],
+            "throttled": self.stats["throttled"],
+            "tokens_charged": self.stats["tokens"]
+        }
@@ -0,0 +1,115 @@
+"""
+Fake Notion API for tests, served through httpx.MockTransport.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import httpx
+
+from d2wiki.notion.wrapper import D2NotionWrapper
+
+ARMOR_ID = "00000001-0000-4000-8000-000000000001"
+
+
+def rich_text(content: str) -> dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "plain_text": content,
+        "href": None,
+        "annotations": {
+            "color": "default", "bold": False, "italic": False, "strikethrough": False, "underline": False, "code": False
+        }
+    }
+
+
+def user(_id: str = "u1") -> dict[str, Any]:
+    return {"object": "user", "id": _id}
+
+
+def armor_row(_id: str = ARMOR_ID, name: str = "경이 방어구", perk: str = "경이 특성",
+              guardian_class: str = "헌터") -> dict[str, Any]:
+    return {
+        "object": "page",
+        "id": _id,
+        "last_edited_time": "2022-08-02T00:00:00.000Z",
+        "url": f"https://www.notion.so/{_id.replace('-', '')}",
+        "icon": None,
+        "properties": {
+            "이름": {"id": "title", "type": "title", "title": [rich_text(name)]},
+            "직업": {"id": "p1", "type": "select", "select": {"name": guardian_class}},
+            "부위": {"id": "p2", "type": "select", "select": {"name": "머리"}},
+            "경이 특성": {"id": "p3", "type": "rich_text", "rich_text": [rich_text(perk)]}
+        }
+    }
+
+
+def armor_schema() -> dict[str, Any]:
+    return {
+        name: {"id": prop["id"], "name": name, "type": prop["type"], prop["type"]: {"options": []}}
+        for name, prop in armor_row()["properties"].items()
+    }
+
+
+def page(_id: str = ARMOR_ID) -> dict[str, Any]:
+    return {
+        "object": "page",
+        "id": _id,
+        "created_time": "2022-08-01T00:00:00.000Z",
+        "created_by": user(),
+        "last_edited_time": "2022-08-02T00:00:00.000Z",
+        "last_edited_by": user(),
+        "archived": False,
+        "cover": None,
+        "icon": None,
+        "parent": {"type": "database_id", "database_id": "d1"},
+        "properties": {},
+        "url": f"https://www.notion.so/{_id.replace('-', '')}"
+    }
+
+
+def block(_id: str, parent_id: str = ARMOR_ID, _type: str = "paragraph", has_children: bool = False,
+          **data: Any) -> dict[str, Any]:
+    return {
+        "object": "block",
+        "id": _id,
+        "parent": {"type": "page_id", "page_id": parent_id},
+        "type": _type,
+        "created_time": "2022-08-01T00:00:00.000Z",
+        "created_by": user(),
+        "last_edited_time": "2022-08-02T00:00:00.000Z",
+        "last_edited_by": user(),
+        "archived": False,
+        "has_children": has_children,
+        _type: data or {"rich_text": [rich_text(_id)], "color": "default"}
+    }
+
+
+def default_handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path.removeprefix("/v1/")
+    if path.startswith("databases/") and path.endswith("/query"):
+        return httpx.Response(200, json={"object": "list", "results": [armor_row()], "has_more": False, "next_cursor": None})
+    if path.startswith("databases/"):
+        return httpx.Response(200, json={
+            "object": "database", "id": path.split("/")[1], "last_edited_time": "2022-08-02T00:00:00.000Z",
+            "properties": armor_schema()
+        })
+    if path.startswith("blocks/"):
+        return httpx.Response(200, json={"object": "list", "results": [], "has_more": False, "next_cursor": None})
+    if path.startswith("pages/"):
+        return httpx.Response(200, json=page(path.split("/")[1]))
+    if path.startswith("users/"):
+        return httpx.Response(200, json=user(path.split("/")[1]))
+    return httpx.Response(404, json={"object": "error", "status": 404, "code": "object_not_found", "message": path})
+
+
+def fake_wrapper(handler: Callable[[httpx.Request], httpx.Response] = default_handler,
+                 **config: Any) -> D2NotionWrapper:
+    """
+    :return: wrapper whose every token calls handler instead of Notion API.
+    """
+    nc = D2NotionWrapper({"token": "test", "http": {"http2": False}, **config})
+    for session in nc.sessions.sessions:
+        session.http.client._transport = httpx.MockTransport(handler)
+    return nc
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from d2wiki.utils.admission import AdmissionController, Overloaded
+
+
+def test_admission_sheds_work_when_queue_is_full():
+    async def main():
+        controller = AdmissionController(concurrency=1, queue_size=1, queue_timeout=1.0)
+        release = asyncio.Event()
+
+        async def work():
+            async with controller.admit():
+                await release.wait()
+
+        running = asyncio.create_task(work())
+        queued = asyncio.create_task(work())
+        await asyncio.sleep(0)
+        assert controller.running == 1 and controller.waiting == 1
+        with pytest.raises(Overloaded, match="queue is full"):
+            async with controller.admit():
+                pass
+        release.set()
+        await asyncio.gather(running, queued)
+        assert controller.metrics()["admitted"] == 2 and controller.metrics()["shed_full"] == 1
+    asyncio.run(main())
+
+
+def test_admission_sheds_work_waiting_beyond_queue_timeout():
+    async def main():
+        controller = AdmissionController(concurrency=1, queue_size=4, queue_timeout=0.05)
+        async with controller.admit():
+            with pytest.raises(Overloaded, match="queue timeout"):
+                async with controller.admit():
+                    pass
+            assert controller.waiting == 0
+        async with controller.admit():      # slot is freed, so next work is admitted right away.
+            pass
+        assert controller.metrics()["shed_timeout"] == 1
+    asyncio.run(main())
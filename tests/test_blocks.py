@@ -0,0 +1,26 @@
+import asyncio
+
+from d2wiki.notion.models import NotionBlock, NotionPage, freeze, thaw
+from .fake_notion import ARMOR_ID, block, fake_wrapper
+
+
+def test_full_parent_is_retrieved_once():
+    async def main():
+        nc = fake_wrapper()
+        child = NotionBlock.from_json(nc=nc, **block("b1"))
+        assert child.parent_ref is None
+        parent = await child.full_parent()
+        assert isinstance(parent, NotionPage) and parent.id == ARMOR_ID
+        assert await child.full_parent() is parent
+    asyncio.run(main())
+
+
+def test_thawed_block_retrieves_parent_again():
+    async def main():
+        nc = fake_wrapper()
+        page = await nc.retrieve_page(ARMOR_ID)
+        child = NotionBlock.from_json(nc=nc, _parent=page, **block("b1"))
+        thawed = thaw(freeze(child), nc)
+        assert thawed == child and thawed.parent_ref is None
+        assert (await thawed.full_parent()).id == ARMOR_ID
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+from notion_client import APIResponseError
+
+from d2wiki.notion.wrapper import CircuitOpenError, NotionUnavailableError
+from d2wiki.notion.wrapper.breaker import CircuitState
+from .fake_notion import default_handler, fake_wrapper
+
+
+def failing(status: int = 503):
+    """
+    :return: handler answering every request with given 5xx status, until `handler.recovered` is set.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if handler.recovered:
+            return default_handler(request)
+        return httpx.Response(status, json={
+            "object": "error", "status": status, "code": "service_unavailable", "message": "Unavailable."
+        })
+
+    handler.calls = calls
+    handler.recovered = False
+    return handler
+
+
+def test_breaker_opens_after_consecutive_5xx():
+    handler = failing()
+
+    async def main():
+        nc = fake_wrapper(handler, retry={"max_attempts": 1}, breaker={"failure_threshold": 3, "reset_timeout": 60})
+        for _ in range(3):
+            with pytest.raises(NotionUnavailableError):
+                await nc.request("users.retrieve", user_id="u1")
+        assert nc.breaker.state is CircuitState.Open
+        with pytest.raises(CircuitOpenError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert len(handler.calls) == 3      # rejected call is never sent.
+    asyncio.run(main())
+
+
+def test_breaker_closes_after_successful_probe():
+    handler = failing()
+
+    async def main():
+        nc = fake_wrapper(handler, retry={"max_attempts": 1}, breaker={"failure_threshold": 1, "reset_timeout": 0.05})
+        with pytest.raises(NotionUnavailableError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert nc.breaker.state is CircuitState.Open
+        handler.recovered = True
+        await asyncio.sleep(0.06)
+        assert (await nc.request("users.retrieve", user_id="u1"))["id"] == "u1"
+        assert nc.breaker.state is CircuitState.Closed
+    asyncio.run(main())
+
+
+def test_client_errors_dont_open_breaker():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"object": "error", "status": 404, "code": "object_not_found", "message": ""})
+
+    async def main():
+        nc = fake_wrapper(handler, breaker={"failure_threshold": 1})
+        with pytest.raises(APIResponseError):
+            await nc.request("users.retrieve", user_id="missing")
+        assert nc.breaker.state is CircuitState.Closed
+    asyncio.run(main())
@@ -0,0 +1,18 @@
+from d2wiki.notion.wrapper.cache import NegativeCache
+
+
+def test_negative_cache_evicts_least_recent():
+    misses = NegativeCache(maxsize=2)
+    misses.add("r", "a")
+    misses.add("r", "b")
+    misses.add("r", "a")
+    misses.add("r", "c")
+    assert len(misses) == 2
+    assert ("r", "a") in misses and ("r", "c") in misses and ("r", "b") not in misses
+
+
+def test_negative_cache_purges_expired_on_add():
+    misses = NegativeCache(ttl=-1.0)
+    for query in ("a", "b", "c"):
+        misses.add("r", query)
+    assert len(misses) == 0
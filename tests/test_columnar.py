@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import pytest
+
+from d2wiki.notion.wrapper import columnar
+from d2wiki.notion.wrapper.columnar import Column, ColumnarTable
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def table(request, monkeypatch) -> ColumnarTable:
+    if request.param and not columnar.NUMPY_AVAILABLE:
+        pytest.skip("numpy is not installed.")
+    monkeypatch.setattr(columnar, "NUMPY_AVAILABLE", request.param)
+    t = ColumnarTable([Column("kind", lambda m: m.kind), Column("cost", lambda m: m.cost, categorical=False)])
+    t.upsert("free", SimpleNamespace(kind="a", cost=0))
+    t.upsert("unknown", SimpleNamespace(kind=None, cost=None))
+    t.upsert("dear", SimpleNamespace(kind="b", cost=3))
+    return t
+
+
+def test_missing_number_matches_no_comparison(table: ColumnarTable):
+    assert table.filter(cost=("<=", 2)) == ["free"]
+    assert table.filter(cost=("!=", 3)) == ["free"]
+    assert table.filter(cost=0) == ["free"]
+
+
+def test_missing_category_matches_no_comparison(table: ColumnarTable):
+    assert table.filter(kind=("!=", "a")) == ["dear"]
+    assert table.filter(kind={"a", "b"}) == ["free", "dear"]
@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import pytest
+
+from d2wiki.notion.wrapper import DeadlineExceededError, deadline
+from .fake_notion import default_handler, fake_wrapper
+
+
+def recording():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return default_handler(request)
+
+    handler.calls = calls
+    return handler
+
+
+def test_expired_deadline_raises_before_request_is_sent():
+    handler = recording()
+
+    async def main():
+        nc = fake_wrapper(handler)
+        with deadline(0.0), pytest.raises(DeadlineExceededError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert handler.calls == []
+    asyncio.run(main())
+
+
+def test_deadline_short_of_a_round_trip_raises_before_request_is_sent():
+    handler = recording()
+
+    async def main():
+        nc = fake_wrapper(handler, deadline={"round_trip": 1.0})
+        with deadline(0.5), pytest.raises(DeadlineExceededError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert handler.calls == []
+        with deadline(2.0):
+            assert (await nc.request("users.retrieve", user_id="u1"))["id"] == "u1"
+    asyncio.run(main())
+
+
+def test_call_outliving_deadline_is_cancelled():
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1.0)
+        return default_handler(request)
+
+    async def main():
+        nc = fake_wrapper(slow, deadline={"round_trip": 0.0})
+        started = asyncio.get_running_loop().time()
+        with deadline(0.1), pytest.raises(DeadlineExceededError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert asyncio.get_running_loop().time() - started < 0.5
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+import asyncio
+
+import httpx
+
+from d2wiki.notion.models import NotionBlockType
+from .fake_notion import ARMOR_ID, block, default_handler, fake_wrapper
+
+CHILDREN = {
+    ARMOR_ID: [
+        block("b1", has_children=True),
+        block("b2", _type="link_to_page", type="comment_id", comment_id="c1")
+    ],
+    "b1": [block("b3", parent_id="b1")]
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    parts = request.url.path.removeprefix("/v1/").split("/")
+    if parts[0] == "blocks":
+        return httpx.Response(200, json={
+            "object": "list", "results": CHILDREN.get(parts[1], []), "has_more": False, "next_cursor": None
+        })
+    return default_handler(request)
+
+
+def test_crawled_blocks_link_to_their_parents():
+    async def main():
+        nc = fake_wrapper(handler)
+        page = await nc.retrieve_page(ARMOR_ID)
+        await nc.retrieve_child_blocks(page)
+        first, link = page.children
+        assert await first.full_parent() is page
+        assert await first.children[0].full_parent() is first
+        # link to a comment is kept as a block, but not followed.
+        assert link.type == NotionBlockType.LINK_TO_PAGE
+        graph = await nc.crawl([ARMOR_ID])
+        assert graph.metrics()["trees"] == 2
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+
+from d2wiki.notion.models import D2ElementalWell, D2ExoticArmor, NotionPage
+from .fake_notion import ARMOR_ID, default_handler, fake_wrapper, page
+
+
+def test_row_then_page_of_same_id():
+    async def main():
+        nc = fake_wrapper()
+        armors = await nc.query_exotic_armor("경이")
+        page = await nc.retrieve_page(ARMOR_ID)
+        assert isinstance(armors[0], D2ExoticArmor)
+        assert isinstance(page, NotionPage)
+        assert isinstance(nc.mirror.get(ARMOR_ID), D2ExoticArmor)
+    asyncio.run(main())
+
+
+def test_page_then_row_of_same_id():
+    async def main():
+        nc = fake_wrapper()
+        page = await nc.retrieve_page(ARMOR_ID)
+        armors = await nc.query_exotic_armor("경이")
+        assert isinstance(page, NotionPage)
+        assert isinstance(armors[0], D2ExoticArmor)
+        assert isinstance(nc.mirror.get(ARMOR_ID), D2ExoticArmor)
+        assert armors[0].embed is not None
+        assert await nc.retrieve_page(ARMOR_ID) is page
+    asyncio.run(main())
+
+
+def test_only_compact_storage_models_are_frozen():
+    nc = fake_wrapper()
+    well = D2ElementalWell.from_json(
+        nc=nc, _id="w1", name="원소 샘", element="태양", mod_type="생성", cost=1, description="", img_url=None
+    )
+    armor = D2ExoticArmor.from_json(
+        nc=nc, _id="a1", name=[], exotic_perk_name=[], guardian_class="헌터", category="머리"
+    )
+    nc.mirror.upsert("wells", well, "t1")
+    nc.mirror.upsert("armors", armor, "t1")
+    assert nc.mirror.rows["wells"]["w1"] is well and nc.mirror.get("w1") is well
+    assert not isinstance(nc.mirror.rows["armors"]["a1"], D2ExoticArmor)
+    assert nc.mirror.get("a1") == armor
+
+
+def test_newer_page_replaces_shared_instance():
+    async def main():
+        edited = {"time": "2022-08-02T00:00:00.000Z"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/v1/pages/"):
+                return httpx.Response(200, json={**page(), "last_edited_time": edited["time"]})
+            return default_handler(request)
+
+        nc = fake_wrapper(handler)
+        old = await nc.retrieve_page(ARMOR_ID)
+        assert await nc.retrieve_page(ARMOR_ID) is old
+        edited["time"] = "2022-08-03T00:00:00.000Z"
+        new = await nc.retrieve_page(ARMOR_ID)
+        assert new is not old and nc.identity.get(NotionPage, ARMOR_ID) is new
+        assert await nc.retrieve_page(ARMOR_ID, version=edited["time"]) is new
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import sys
+
+import pytest
+
+from d2wiki.utils.importtime import lazy_import
+
+
+def test_lazy_import_executes_module_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "heavy_dependency.py").write_text("import builtins\nbuiltins.heavy_loaded = True\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "heavy_dependency", raising=False)
+    import builtins
+    monkeypatch.setattr(builtins, "heavy_loaded", False, raising=False)
+
+    module = lazy_import("heavy_dependency")
+    assert not builtins.heavy_loaded
+    assert module.VALUE == 42 and builtins.heavy_loaded
+    assert lazy_import("heavy_dependency") is sys.modules["heavy_dependency"]
+
+
+def test_lazy_import_of_missing_module_raises():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("d2wiki_no_such_module")
@@ -0,0 +1,16 @@
+from d2wiki.utils.quota import Quotas, TokenBucket
+
+
+def test_cost_above_capacity_takes_full_bucket():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    assert bucket.retry_after(8) == 0
+    bucket.take(8)
+    assert bucket.tokens < 1e-3
+    assert 4.9 < bucket.retry_after(8) <= 5.0
+
+
+def test_request_costing_more_than_user_capacity_is_admitted():
+    quotas = Quotas({"user": {"rate": 0.2, "capacity": 3}})
+    assert quotas.acquire(1, 10, 5) == 0
+    assert quotas.acquire(1, 10, 5) > 0
+    assert quotas.acquire(2, 10, 5) == 0
@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+from d2wiki.notion.wrapper import NotionUnavailableError, retry_budget
+from .fake_notion import default_handler, fake_wrapper
+
+
+def rate_limited(times: int, retry_after: str = "0.2"):
+    """
+    :return: handler answering 429 with Retry-After to the first `times` requests.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= times:
+            return httpx.Response(429, headers={"Retry-After": retry_after}, json={
+                "object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited."
+            })
+        return default_handler(request)
+
+    handler.calls = calls
+    return handler
+
+
+def test_rate_limited_call_is_retried_after_throttling_token():
+    handler = rate_limited(1)
+
+    async def main():
+        nc = fake_wrapper(handler)
+        session = nc.sessions.sessions[0]
+        started = asyncio.get_running_loop().time()
+        resp = await nc.request("users.retrieve", user_id="u1")
+        assert resp["id"] == "u1"
+        # single token is left out until Retry-After passes, so the retry waits for it.
+        assert asyncio.get_running_loop().time() - started >= 0.15
+        assert session.throttled_until > 0
+        assert len(handler.calls) == 2
+        assert nc.retry.metrics()["rate_limited"] == 1 and nc.retry.metrics()["retries"] == 1
+        # rate limit is not an outage, so it doesn't count toward opening the circuit.
+        assert nc.breaker.failures == 0
+    asyncio.run(main())
+
+
+def test_rate_limited_token_is_left_out_of_rotation():
+    handler = rate_limited(1, retry_after="30")
+
+    async def main():
+        nc = fake_wrapper(handler, token=["first", "second"])
+        await nc.request("users.retrieve", user_id="u1")
+        throttled = [s for s in nc.sessions.sessions if s.throttled_for > 0]
+        assert len(throttled) == 1
+        # Retry-After is capped by max_delay of retry policy.
+        assert throttled[0].throttled_for <= nc.retry.max_delay
+        assert {r.headers["Authorization"] for r in handler.calls} == {"Bearer first", "Bearer second"}
+    asyncio.run(main())
+
+
+def test_retries_stop_at_interaction_budget():
+    handler = rate_limited(10, retry_after="0.01")
+
+    async def main():
+        nc = fake_wrapper(handler)
+        with retry_budget(1), pytest.raises(NotionUnavailableError):
+            await nc.request("users.retrieve", user_id="u1")
+        assert len(handler.calls) == 2
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+
+import pytest
+
+from d2wiki.notion.models import D2ExoticWeapon
+from d2wiki.notion.wrapper import D2NotionRoute, SchemaError
+from d2wiki.notion.wrapper.schema import compile_decoder
+from .fake_notion import ARMOR_ID, fake_wrapper, rich_text
+
+logger = logging.getLogger("d2wiki.notion")
+
+
+def weapon_row() -> dict:
+    return {
+        "id": "w1",
+        "icon": None,
+        "properties": {
+            "이름": {"id": "title", "type": "title", "title": [rich_text("경이 무기")]},
+            "경이 특성": {"id": "p1", "type": "rich_text", "rich_text": [rich_text("경이 특성")]}
+        }
+    }
+
+
+def test_missing_optional_property_decodes_as_none():
+    nc = fake_wrapper()
+    schema = {
+        "이름": {"id": "title", "type": "title", "title": {}},
+        "경이 특성": {"id": "p1", "type": "rich_text", "rich_text": {}}
+    }
+    weapon = compile_decoder(nc, "d1", D2ExoticWeapon, schema, logger)(weapon_row())
+    assert weapon.name == "경이 무기"
+    assert weapon.description is None
+
+
+def test_missing_required_property_raises():
+    nc = fake_wrapper()
+    with pytest.raises(SchemaError):
+        compile_decoder(nc, "d1", D2ExoticWeapon, {"이름": {"id": "title", "type": "title", "title": {}}}, logger)
+
+
+def test_schema_error_disables_only_its_database():
+    async def main():
+        nc = fake_wrapper()     # every database has exotic armor schema.
+        await nc.sync()
+        assert nc.mirror.get(ARMOR_ID) is not None
+        assert D2NotionRoute.Exotics.Armors not in nc.schema_errors
+        assert D2NotionRoute.CombatStyleMods.ElementalWells in nc.schema_errors
+        with pytest.raises(SchemaError):
+            await nc.query_elemental_well("원소")
+    asyncio.run(main())
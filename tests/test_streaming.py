@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+import pytest
+
+from d2wiki.notion.wrapper.streaming import STREAMING_AVAILABLE
+from .fake_notion import ARMOR_ID, block, default_handler, fake_wrapper
+
+
+@pytest.mark.skipif(not STREAMING_AVAILABLE, reason="streaming decode needs 'ijson' package.")
+def test_streamed_body_keeps_token_loaded_until_closed():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            return httpx.Response(200, json={
+                "object": "list", "results": [block("b1"), block("b2")], "has_more": False, "next_cursor": None
+            })
+        return default_handler(request)
+
+    async def main():
+        nc = fake_wrapper(handler, stream_blocks=True)
+        session = nc.sessions.sessions[0]
+        children = nc.iter_children(ARMOR_ID)
+        await children.__anext__()
+        assert session.in_flight == 1
+        await children.aclose()
+        assert session.in_flight == 0
+    asyncio.run(main())
+
+
+class BrokenBody(httpx.AsyncByteStream):
+    """
+    Response body whose connection drops before any bytes arrive.
+    """
+    async def __aiter__(self):
+        raise httpx.ReadError("connection reset")
+        yield b""
+
+
+@pytest.mark.skipif(not STREAMING_AVAILABLE, reason="streaming decode needs 'ijson' package.")
+def test_read_error_of_streamed_body_propagates():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            return httpx.Response(200, headers={"Content-Type": "application/json"}, stream=BrokenBody())
+        return default_handler(request)
+
+    async def main():
+        nc = fake_wrapper(handler, stream_blocks=True, retry={"max_attempts": 1})
+        with pytest.raises(httpx.ReadError):
+            async for _ in nc.iter_children(ARMOR_ID):
+                pass
+        session = nc.sessions.sessions[0]
+        assert session.in_flight == 0 and session.http.stats["response_bytes"] == 0
+    asyncio.run(main())
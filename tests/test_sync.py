@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+
+from d2wiki.notion.models import D2GuardianClass
+from d2wiki.notion.wrapper import D2NotionRoute
+from .fake_notion import armor_row, default_handler, fake_wrapper
+
+
+def empty_query(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/query"):
+        return httpx.Response(200, json={"object": "list", "results": [], "has_more": False, "next_cursor": None})
+    return default_handler(request)
+
+
+def test_empty_database_syncs_again():
+    async def main():
+        nc = fake_wrapper(empty_query)
+        route = D2NotionRoute.Exotics.Armors
+        assert await nc.sync_database(route) == 0
+        assert route in nc.synced_at
+        assert await nc.sync_database(route) == 0
+    asyncio.run(main())
+
+
+def test_failing_database_doesnt_stop_sync():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if D2NotionRoute.Exotics.Weapons in request.url.path and request.url.path.endswith("/query"):
+            return httpx.Response(200, json={"object": "list"})     # malformed response.
+        return default_handler(request)
+
+    async def main():
+        nc = fake_wrapper(handler)
+        await nc.sync()
+        assert D2NotionRoute.Exotics.Armors in nc.mirror.synced
+    asyncio.run(main())
+
+
+class Rows:
+    """
+    Armor database whose rows are edited between syncs.
+    """
+    def __init__(self, *rows: dict):
+        self.rows: dict[str, dict] = {r["id"]: r for r in rows}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/query"):
+            return httpx.Response(200, json={
+                "object": "list", "results": list(self.rows.values()), "has_more": False, "next_cursor": None
+            })
+        return default_handler(request)
+
+
+OTHER_ID = "00000002-0000-4000-8000-000000000002"
+
+
+def synced_rows() -> Rows:
+    return Rows(armor_row(), armor_row(OTHER_ID, name="다른 방어구", perk="사라질 특성", guardian_class="워록"))
+
+
+def test_deleted_row_is_dropped_by_full_resync():
+    async def main():
+        rows = synced_rows()
+        nc = fake_wrapper(rows, full_sync_interval=0)
+        route = D2NotionRoute.Exotics.Armors
+        await nc.sync_database(route)
+        assert [getattr(m, "id") for m in nc.mirror.search("사라질")] == [OTHER_ID]
+        del rows.rows[OTHER_ID]     # query of Notion never returns deleted rows.
+        assert await nc.sync_database(route) == 1
+        assert nc.mirror.search("사라질") == []
+        assert nc.mirror.filter(route, guardian_class=D2GuardianClass("워록")) == []
+        assert nc.mirror.match_name(route, "다른") == []
+    asyncio.run(main())
+
+
+def test_archived_row_is_dropped_by_incremental_sync():
+    async def main():
+        rows = synced_rows()
+        nc = fake_wrapper(rows)
+        route = D2NotionRoute.Exotics.Armors
+        await nc.sync_database(route)
+        rows.rows[OTHER_ID]["archived"] = True
+        assert await nc.sync_database(route) == 1
+        assert nc.mirror.search("사라질") == []
+        assert nc.mirror.filter(route, guardian_class=D2GuardianClass("워록")) == []
+    asyncio.run(main())